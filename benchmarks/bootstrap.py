@@ -0,0 +1,12 @@
+#
+# Makes the coopy package of this repository importable by the benchmarks, which
+# are run as scripts (python benchmarks/<name>.py) without installing it. Import
+# it before coopy.
+#
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+if not ROOT in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,51 @@
+#
+# Enumerated sorts: time to colour a random graph with three colours, given by
+# constants of a declared sort closed by a quantified axiom, or by the members
+# of an enumerated sort.
+#
+import bootstrap
+import coopy
+import random
+import sys
+import time
+
+from coopy import forall
+
+def declared():
+    C = coopy.sort('C')
+    colours = [coopy.symbolic(name, C) for name in 'rgb']
+    q = coopy.symbolic('q', C)
+    coopy.require(coopy.all([a != b for i, a in enumerate(colours) for b in colours[i + 1:]]))
+    coopy.require(forall([q], coopy.any([q == c for c in colours])))
+    return C
+
+def enumerated():
+    return coopy.enum_sort('Colour', ['r', 'g', 'b'])
+
+def colour(sort, n, p):
+    random.seed(0)
+    nodes = [coopy.symbolic('x', sort) for i in range(n)]
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            if random.uniform(0, 1) < p:
+                coopy.require(nodes[i] != nodes[j])
+    coopy.concretize()
+
+def run(declare, n, repeat):
+    best = None
+    for i in range(repeat):
+        coopy.reset()
+        start = time.perf_counter()
+        with coopy.scope():
+            colour(declare(), n, 3.0 / n)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main(n=80, repeat=3):
+    print('{} nodes'.format(n))
+    print('declared sort   {:8.3f} ms'.format(run(declared, n, repeat) * 1000))
+    print('enumerated sort {:8.3f} ms'.format(run(enumerated, n, repeat) * 1000))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
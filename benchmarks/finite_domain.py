@@ -0,0 +1,42 @@
+#
+# Small query benchmark: median latency of building and solving many tiny
+# finite domain models, with and without the built-in finite domain engine.
+#
+import bootstrap
+import coopy
+import random
+import statistics
+import sys
+import time
+
+from coopy.smt import backend
+
+def query(size, rng):
+    with coopy.scope():
+        xs = [coopy.symbolic_int('x') for i in range(size)]
+        for x in xs:
+            coopy.require((x >= 0) & (x < 10))
+        target = rng.randint(size, 5 * size)
+        coopy.require(sum(xs) == target)
+        for a, b in zip(xs, xs[1:]):
+            coopy.require(a != b)
+        coopy.concretize()
+
+def run(limit, queries, size):
+    backend.finite_domain_limit = limit
+    rng = random.Random(0)
+    samples = []
+    for i in range(queries):
+        start = time.perf_counter()
+        query(size, rng)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def main(queries=200, size=4):
+    default = backend.finite_domain_limit
+    print('{} queries over {} variables each'.format(queries, size))
+    print('z3 only              {:8.3f} ms'.format(run(0, queries, size) * 1000))
+    print('finite domain engine {:8.3f} ms'.format(run(default, queries, size) * 1000))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
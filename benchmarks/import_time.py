@@ -0,0 +1,35 @@
+#
+# Import time benchmark: measures, in fresh interpreters, how long it takes
+# to import coopy and how long it then takes to create a symbol and solve
+# (which is when the backend and Z3 are loaded).
+#
+import bootstrap
+import statistics
+import subprocess
+import sys
+
+SCRIPT = '''
+import time
+start = time.perf_counter()
+import coopy
+imported = time.perf_counter()
+x = coopy.symbolic_int('x')
+coopy.require(x > 0)
+coopy.check_sat()
+solved = time.perf_counter()
+print(imported - start, solved - imported)
+'''
+
+def measure():
+    output = subprocess.run([sys.executable, '-c', SCRIPT], check=True, cwd=bootstrap.ROOT,
+        stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return [float(value) for value in output.split()]
+
+def main(runs=10):
+    samples = [measure() for i in range(runs)]
+    imports, solves = zip(*samples)
+    print('import coopy      {:8.2f} ms (median of {})'.format(statistics.median(imports) * 1000, runs))
+    print('first solve       {:8.2f} ms (median of {})'.format(statistics.median(solves) * 1000, runs))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
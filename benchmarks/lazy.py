@@ -0,0 +1,33 @@
+#
+# Lazy concretization: time to concretize a model over many integers and read
+# back only a few of them, eagerly and lazily.
+#
+import bootstrap
+import coopy
+import sys
+import time
+
+def run(n, reads, lazy, repeat):
+    best = None
+    for i in range(repeat):
+        coopy.reset()
+        with coopy.scope():
+            xs = [coopy.symbolic_int('x') for i in range(n)]
+            for a, b in zip(xs, xs[1:]):
+                coopy.require(a < b)
+            coopy.require(xs[0] >= 0)
+            model = coopy.model()
+            start = time.perf_counter()
+            coopy.concretize(model=model, lazy=lazy)
+            values = [int(x) for x in xs[:reads]]
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main(n=2000, reads=20, repeat=3):
+    print('{} integers, {} of them read'.format(n, reads))
+    print('eager {:8.3f} ms'.format(run(n, reads, False, repeat) * 1000))
+    print('lazy  {:8.3f} ms'.format(run(n, reads, True, repeat) * 1000))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
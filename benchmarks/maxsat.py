@@ -0,0 +1,48 @@
+#
+# Weighted MaxSAT benchmark: solves the same randomly generated instance
+# (random 3-SAT hard clauses plus weighted unit preferences)
+# with each of the available MaxSAT engines and reports the solve time and
+# the cost of the solution found.
+#
+import bootstrap
+import coopy
+import random
+import sys
+import time
+
+from coopy import neg
+
+def random_literal(variables):
+    variable = random.choice(variables)
+    return variable if random.randint(0, 1) else neg(variable)
+
+def build_instance(variables, hard, soft, seed):
+    random.seed(seed)
+    xs = [coopy.symbolic_bool('b') for i in range(variables)]
+    for i in range(hard):
+        coopy.require(coopy.any([random_literal(xs) for j in range(3)]))
+    clauses = []
+    for i in range(soft):
+        clause = random_literal(xs)
+        weight = random.randint(1, 100)
+        coopy.soft(clause, weight=weight)
+        clauses.append((clause, weight))
+    return clauses
+
+def run(engine, variables, hard, soft, seed):
+    with coopy.optimizer(maxsat=engine):
+        clauses = build_instance(variables, hard, soft, seed)
+        start = time.perf_counter()
+        sat, model = coopy.check_sat()
+        elapsed = time.perf_counter() - start
+        cost = sum(weight for clause, weight in clauses if not model[clause])
+        return elapsed, cost
+
+def main(variables=40, hard=60, soft=200, seed=0):
+    print('{} variables, {} hard clauses, {} weighted soft clauses'.format(variables, hard, soft))
+    for engine in coopy.solver.maxsat_engines:
+        elapsed, cost = run(engine, variables, hard, soft, seed)
+        print('{:12s} {:8.3f} s  cost {}'.format(engine, elapsed, cost))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
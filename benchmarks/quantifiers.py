@@ -0,0 +1,54 @@
+#
+# Quantifier instantiation: time to solve the boolean algebra axioms of
+# example 4 over a two valued enumerated sort, along with a chain of
+# complements, with the axioms given as quantifiers or expanded over the
+# members of the sort.
+#
+import bootstrap
+import coopy
+import sys
+import time
+
+from coopy import forall
+
+def algebra(size, expand):
+    B = coopy.enum_sort('B', ['T', 'F'])
+    T, F = B
+    NOT = coopy.function('~', B, B)
+    AND = coopy.function('*', B, B, B)
+    OR = coopy.function('+', B, B, B)
+    p, q, r = [coopy.symbolic(name, B) for name in 'pqr']
+    options = {'domain': B} if expand else {}
+    constraints = [
+        forall([p, q], OR(p, q) == OR(q, p), **options),
+        forall([p, q], AND(p, q) == AND(q, p), **options),
+        forall([p, q, r], OR(r, AND(p, q)) == AND(OR(r, p), OR(r, q)), **options),
+        forall([p, q, r], AND(r, OR(p, q)) == OR(AND(r, p), AND(r, q)), **options),
+        forall([p], OR(p, F) == p, **options),
+        forall([p], AND(p, T) == p, **options),
+        forall([p], OR(p, NOT(p)) == T, **options),
+        forall([p], AND(p, NOT(p)) == F, **options)]
+    xs = [coopy.symbolic('x', B) for i in range(size)]
+    constraints += [xs[0] == T] + [b == NOT(a) for a, b in zip(xs, xs[1:])]
+    return constraints
+
+def run(size, expand, repeat):
+    best = None
+    for i in range(repeat):
+        coopy.reset()
+        start = time.perf_counter()
+        with coopy.scope():
+            for constraint in algebra(size, expand):
+                coopy.require(constraint)
+            coopy.concretize()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main(size=50, repeat=5):
+    print('chain of {} complements'.format(size))
+    print('quantified {:8.3f} ms'.format(run(size, False, repeat) * 1000))
+    print('expanded   {:8.3f} ms'.format(run(size, True, repeat) * 1000))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,44 @@
+#
+# Soak benchmark: repeatedly build and discard candidate sub-models and
+# report the resident set size of the process along the way. With children
+# being weakly referenced by the front-end, memory should stay flat.
+#
+import bootstrap
+import coopy
+import gc
+import os
+import resource
+import sys
+
+def rss_kb():
+    # Prefer the current resident set size, which is available on Linux.
+    # Fall back to the peak resident set size elsewhere.
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def build_candidate(size):
+    xs = [coopy.symbolic_int('x') for i in range(size)]
+    for a, b in zip(xs, xs[1:]):
+        coopy.require(a < b)
+    return xs
+
+def main(cycles=2000, size=20, report_every=250):
+    coopy.reset()
+    for cycle in range(1, cycles + 1):
+        coopy.push()
+        candidate = build_candidate(size)
+        coopy.check_sat()
+        coopy.pop()
+        # Discard the candidate.
+        del candidate
+        if cycle % report_every == 0:
+            gc.collect()
+            print('cycle {:6d}  rss {:8d} KiB  children {:6d}'.format(
+                cycle, rss_kb(), len(coopy.solver._children)))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
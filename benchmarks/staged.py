@@ -0,0 +1,56 @@
+#
+# Staged planning: a chain of decisions fixed a few at a time. Either every
+# stage rebuilds and solves the whole model in a fresh scope, with the values
+# of earlier stages given as constraints, or all stages share one scope and
+# concretize only their own decisions.
+#
+import bootstrap
+import coopy
+import sys
+import time
+
+def constraints(xs):
+    output = [xs[0] >= 0]
+    for a, b in zip(xs, xs[1:]):
+        output.append((b > a) & (b <= a + 3))
+    return output
+
+def restarting(stages, size):
+    fixed = []
+    for stage in range(stages):
+        with coopy.scope():
+            xs = [coopy.symbolic_int('x') for i in range(stages * size)]
+            for constraint in constraints(xs):
+                coopy.require(constraint)
+            for x, value in zip(xs, fixed):
+                coopy.require(x == value)
+            coopy.concretize()
+            fixed = [x.value for x in xs[:(stage + 1) * size]]
+    return fixed
+
+def partial(stages, size):
+    with coopy.scope():
+        xs = [coopy.symbolic_int('x') for i in range(stages * size)]
+        for constraint in constraints(xs):
+            coopy.require(constraint)
+        for stage in range(stages):
+            coopy.concretize(only=xs[stage * size:(stage + 1) * size])
+        return [x.value for x in xs]
+
+def run(plan, stages, size, repeat):
+    best = None
+    for i in range(repeat):
+        coopy.reset()
+        start = time.perf_counter()
+        plan(stages, size)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main(stages=10, size=20, repeat=3):
+    print('{} stages of {} decisions'.format(stages, size))
+    print('restarting {:8.3f} ms'.format(run(restarting, stages, size, repeat) * 1000))
+    print('partial    {:8.3f} ms'.format(run(partial, stages, size, repeat) * 1000))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,231 @@
+#
+# Benchmark suite: scalable versions of the shipped examples, each run in
+# four phases (construction of the coopy expressions, lowering and adding
+# them to the solver, solving and concretization). Reports the time and the
+# peak of memory allocated by Python in each phase, and optionally saves the
+# results as a JSON baseline or compares them against a previous one.
+#
+# Usage: python benchmarks/suite.py [--scale N] [--repeat N] [--only CASE ...]
+#                                   [--save FILE] [--compare FILE] [--tolerance X]
+#
+# Times depend on the machine, so baselines are not kept in the repository: record
+# one (--save FILE) before making changes, and compare against it (--compare FILE)
+# on the same machine afterwards. Both keep the best of at least MIN_REPEAT runs
+# of each case, since single runs are too noisy to compare.
+#
+import argparse
+import bootstrap
+import coopy
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from coopy import neg, forall
+
+PHASES = ('construction', 'lowering', 'solving', 'concretization')
+
+MIN_REPEAT = 3
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+# Graph colouring (examples 2 and 5): k colours, n nodes, edges with probability p.
+
+def colouring(scale):
+    random.seed(0)
+    n, k, p = 30 * scale, 4, 0.1
+    def construct():
+        colors = [coopy.symbolic_int('c') for i in range(n)]
+        constraints = [coopy.any([c == i for i in range(k)]) for c in colors]
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                if random.uniform(0, 1) < p:
+                    constraints.append(neg(colors[i] == colors[j]))
+        return constraints
+    return construct
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+# Bounded model checking of the two buckets problem (example 3), unrolled over
+# a number of steps.
+
+def bmc(scale):
+    steps, capacities, target = 6 * scale, (3, 5), 4
+    def construct():
+        history = [[coopy.symbolic_int('wv') for c in capacities] for i in range(steps + 1)]
+        constraints = [v == 0 for v in history[0]]
+        for state in history:
+            constraints += [(v >= 0) & (v <= c) for v, c in zip(state, capacities)]
+        for (a0, b0), (a1, b1) in zip(history, history[1:]):
+            ca, cb = capacities
+            outcome = (a1 == ca) & (b1 == b0)
+            outcome |= (a1 == a0) & (b1 == cb)
+            outcome |= (a1 == 0) & (b1 == b0)
+            outcome |= (a1 == a0) & (b1 == 0)
+            outcome |= ((a1 == 0) & (b1 == a0 + b0)) | ((a1 == a0 - (cb - b0)) & (b1 == cb))
+            outcome |= ((b1 == 0) & (a1 == a0 + b0)) | ((b1 == b0 - (ca - a0)) & (a1 == ca))
+            constraints.append(outcome)
+        constraints.append(history[-1][1] == target)
+        return constraints
+    return construct
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+# Boolean algebra axioms over an uninterpreted sort (example 4), along with a
+# chain of additional constants, each one the complement of the previous one.
+
+def algebra(scale):
+    def construct():
+        B = coopy.sort('B')
+        NOT = coopy.function('~', B, B)
+        AND = coopy.function('*', B, B, B)
+        OR = coopy.function('+', B, B, B)
+        T, F = coopy.symbolic('T', B), coopy.symbolic('F', B)
+        p, q, r = [coopy.symbolic(name, B) for name in 'pqr']
+        constraints = [
+            T != F,
+            forall([p], (p == T) | (p == F)),
+            forall([p, q], OR(p, q) == OR(q, p)),
+            forall([p, q], AND(p, q) == AND(q, p)),
+            forall([p, q, r], OR(r, AND(p, q)) == AND(OR(r, p), OR(r, q))),
+            forall([p, q, r], AND(r, OR(p, q)) == OR(AND(r, p), AND(r, q))),
+            forall([p], OR(p, F) == p),
+            forall([p], AND(p, T) == p),
+            forall([p], OR(p, NOT(p)) == T),
+            forall([p], AND(p, NOT(p)) == F)]
+        xs = [coopy.symbolic('x', B) for i in range(10 * scale)]
+        constraints += [xs[0] == T] + [b == NOT(a) for a, b in zip(xs, xs[1:])]
+        return constraints
+    return construct
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+# Optimization: a knapsack like problem with a lexicographic pair of objectives.
+
+def optimizer(scale):
+    random.seed(0)
+    n = 20 * scale
+    weights = [random.randint(1, 20) for i in range(n)]
+    values = [random.randint(1, 20) for i in range(n)]
+    def construct():
+        xs = [coopy.symbolic_int('x') for i in range(n)]
+        constraints = [(x >= 0) & (x <= 1) for x in xs]
+        total_weight = sum(w * x for w, x in zip(weights, xs))
+        constraints.append(total_weight <= 5 * n)
+        coopy.maximize(sum(v * x for v, x in zip(values, xs)))
+        coopy.minimize(total_weight)
+        return constraints
+    return construct, True
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+# Arrays: chains of reads and writes over a symbolic array.
+
+def arrays(scale):
+    n = 50 * scale
+    def construct():
+        array = coopy.symbolic_array('a')
+        constraints = [array[i] < array[i + 1] for i in range(n)]
+        constraints.append(array[0] == 0)
+        return constraints
+    return construct
+
+CASES = {
+    'colouring': colouring,
+    'bmc': bmc,
+    'algebra': algebra,
+    'optimizer': optimizer,
+    'arrays': arrays
+}
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+
+def measure(function):
+    # Time and peak of memory allocated on top of what was in use before.
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    output = function()
+    elapsed = time.perf_counter() - start
+    return output, elapsed, tracemalloc.get_traced_memory()[1] - baseline
+
+def run_case(name, scale):
+    case = CASES[name](scale)
+    construct, is_optimizer = case if isinstance(case, tuple) else (case, False)
+    results = {}
+    coopy.reset()
+    with (coopy.optimizer() if is_optimizer else coopy.scope()):
+        constraints, results['construction'], peak_construction = measure(construct)
+        _, results['lowering'], peak_lowering = measure(lambda: [coopy.require(c) for c in constraints])
+        model, results['solving'], peak_solving = measure(coopy.model)
+        _, results['concretization'], peak_concretization = measure(lambda: coopy.concretize(model=model))
+    peaks = [peak_construction, peak_lowering, peak_solving, peak_concretization]
+    return {phase: {'time': results[phase], 'peak': peak} for phase, peak in zip(PHASES, peaks)}
+
+def run(cases, scale, repeat):
+    # Keep the best time of all repetitions for each phase.
+    tracemalloc.start()
+    try:
+        output = {}
+        for name in cases:
+            for i in range(repeat):
+                result = run_case(name, scale)
+                best = output.setdefault(name, result)
+                for phase in PHASES:
+                    if result[phase]['time'] < best[phase]['time']:
+                        best[phase] = result[phase]
+        return output
+    finally:
+        tracemalloc.stop()
+
+def report(results, baseline=None, tolerance=0.2):
+    regressions = []
+    for name, phases in results.items():
+        for phase in PHASES:
+            current = phases[phase]
+            line = '{:10s} {:15s} {:9.4f} s {:10d} KiB'.format(
+                name, phase, current['time'], current['peak'] // 1024)
+            reference = (baseline or {}).get(name, {}).get(phase)
+            if reference is not None and reference['time'] > 0:
+                ratio = current['time'] / reference['time']
+                line += '  x{:.2f}'.format(ratio)
+                if ratio > 1 + tolerance:
+                    line += '  REGRESSION'
+                    regressions.append((name, phase))
+            print(line)
+    return regressions
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='coopy benchmark suite')
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='+', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--save', help='save results as a JSON baseline')
+    parser.add_argument('--compare', help='compare results against a JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+        help='relative slowdown allowed before reporting a regression')
+    args = parser.parse_args(argv)
+    if (args.save or args.compare) and args.repeat < MIN_REPEAT:
+        parser.error('--save and --compare need --repeat {} or more'.format(MIN_REPEAT))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('scale') != args.scale:
+            print('warning: baseline was recorded with scale {}'.format(baseline.get('scale')))
+        baseline = baseline['results']
+
+    results = run(args.only, args.scale, args.repeat)
+    regressions = report(results, baseline, args.tolerance)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'scale': args.scale, 'results': results}, f, indent=2)
+
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -5,6 +5,8 @@ from .op.logic import Exists as exists
 from .op.logic import Iff as iff
 from .op.other import ITE as ite
 from .frontend import Front
+from .smt.unsat import UnsatCore, Unsatisfiable
+from .smt import solve_smtlib
 
 import functools
 
@@ -15,20 +17,44 @@ symbolic_int = solver.symbolic_int
 symbolic_real = solver.symbolic_real
 symbolic_bool = solver.symbolic_bool
 symbolic_int_array = solver.symbolic_int_array
+symbolic_array = solver.symbolic_array
+constant_array = solver.constant_array
 concretize = solver.concretize
+materialize = solver.materialize
 model = solver.model
 check_sat = solver.check_sat
+solutions = solver.solutions
 reset = solver.reset
+export = solver.export
+import_model = solver.import_model
+unsat_core = solver.unsat_core
+relax = solver.relax
+enforce = solver.enforce
 maximize = solver.maximize
 minimize = solver.minimize
+improving_models = solver.improving_models
+pareto_front = solver.pareto_front
 push = solver.push
 pop = solver.pop
 wrap_concrete = solver.wrap_concrete
+real_vector = solver.real_vector
+enable_cache = solver.enable_cache
+disable_cache = solver.disable_cache
+enable_instrumentation = solver.enable_instrumentation
+disable_instrumentation = solver.disable_instrumentation
+instrumentation = solver.instrumentation
 
 scope = solver.scope
+assumption_scope = solver.assumption_scope
+template = solver.template
 optimizer = solver.optimizer
 
 sort = solver.sort
+enum_sort = solver.enum_sort
+int_sort = solver.int_sort
+bool_sort = solver.bool_sort
+real_sort = solver.real_sort
+bitvec_sort = solver.bitvec_sort
 symbolic = solver.symbolic
 function = solver.uninterpreted_function
 
@@ -37,12 +63,18 @@ neg = Predicate.negate
 # The following function is meant to make
 # expressions like (x > y).require() more natural
 # by writing them like require(x > y).
-def require(constraint):
+def require(constraint, label=None):
     if isinstance(constraint, Predicate):
-        constraint.require()
+        constraint.require(label)
     elif not (type(constraint) == bool and constraint == True):
         raise Exception('Cannot require {} as a constraint'.format(constraint))
 
+def soft(constraint, weight=1, group=None):
+    if isinstance(constraint, Predicate):
+        constraint.soft(weight=weight, group=group)
+    elif not (type(constraint) == bool and constraint == True):
+        raise Exception('Cannot require {} as a soft constraint'.format(constraint))
+
 def all(constraints):
     if not constraints: 
         return EmptyPredicate()
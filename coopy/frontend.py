@@ -1,13 +1,31 @@
 from .smt import backend
-from .symbolic import Evaluable
+from .instrumentation import instrumentation
+from .symbolic import Evaluable, Symbol, is_concrete_like, do_evaluate
 from .symbolic.types import *
 
+import enum
+import functools
+import json
+import weakref
+
 class Front:
 
     def __init__(self):
-        self._default_scope = FrontScope(self, backend, backend.default_scope)
+        # The default scope is created on first use, along with the backend.
+        self._default = None
         self._transient_scopes = []
         self._enable_concretization = True
+        self._enum_sorts = {}
+
+    @property
+    def _default_scope(self):
+        if self._default is None:
+            self._default = FrontScope(self, backend, backend.default_scope)
+        return self._default
+
+    @property
+    def backend_loaded(self):
+        return backend.loaded
 
     @property
     def concretization_enabled(self):
@@ -22,8 +40,52 @@ class Front:
     def scope(self):
         return self._scope(backend.scope())
 
-    def optimizer(self):
-        return self._scope(backend.optimizer())
+    def assumption_scope(self):
+        # A lighter alternative to push and pop within the active scope, meant
+        # for many what-if queries over the same base model.
+        return AssumptionScope(backend)
+
+    def template(self, function):
+        return Template(self, function)
+
+    @property
+    def cache(self):
+        return backend.cache
+
+    @property
+    def instrumentation(self):
+        return instrumentation
+
+    def enable_instrumentation(self):
+        # Record counts and times of the phases of building and solving models,
+        # in total, per backend scope and per call (see Instrumentation).
+        instrumentation.enable()
+
+    def disable_instrumentation(self):
+        instrumentation.disable()
+
+    def enable_cache(self, maxsize=128, directory=None):
+        # Cache results of satisfiability checks, keyed by the structure of the
+        # assertions (i.e. regardless of the names of autogenerated symbols).
+        # An additional on-disk tier is kept in the given directory, if any.
+        backend.enable_cache(maxsize, directory)
+
+    def disable_cache(self):
+        backend.disable_cache()
+
+    @property
+    def maxsat_engines(self):
+        return backend.maxsat_engines
+
+    def optimizer(self, priority=None, on_model=None, maxsat=None):
+        # Priority may be 'lex' (the default), 'pareto' or 'box'. If given,
+        # on_model is called with each improving model found while optimizing.
+        # The engine used for soft constraints may be selected through maxsat
+        # (see maxsat_engines).
+        scope = self._scope(backend.optimizer(priority, maxsat))
+        if on_model is not None:
+            scope.on_model(on_model)
+        return scope
 
     def exit_scope(self):
         self._transient_scopes.pop()
@@ -44,40 +106,116 @@ class Front:
     def check_sat(self):
         return self._active_scope.check_sat()
 
-    def model(self):
-        return self._active_scope.model()
+    def unsat_core(self, minimize=False):
+        # Labels (and predicates) involved in the conflict found by the last
+        # unsuccessful check of the active scope.
+        return self._active_scope.unsat_core(minimize)
+
+    def relax(self, label):
+        # Disable the constraints required under the given label, without
+        # removing them from the solver.
+        self._active_scope.relax(label)
+
+    def enforce(self, label):
+        self._active_scope.enforce(label)
+
+    def model(self, decompose=False, pool=None, hints=None):
+        return self._active_scope.model(decompose, pool, hints)
+
+    def export(self, path=None):
+        # Export the active scope as SMT-LIB2 text plus a manifest, written to
+        # the given path and a JSON sidecar next to it if a path is given.
+        return self._active_scope.export(path)
+
+    def import_model(self, values):
+        # Model for the active scope given values keyed by symbol name (e.g.
+        # solved out of process), to be passed to concretize.
+        return self._active_scope.import_model(values)
 
     def minimize(self, expression):
-        self._active_scope.minimize(expression)
+        return self._active_scope.minimize(expression)
 
     def maximize(self, expression):
-        self._active_scope.maximize(expression)
+        return self._active_scope.maximize(expression)
+
+    def improving_models(self, timeout=None):
+        return self._active_scope.improving_models(timeout)
+
+    def pareto_front(self):
+        return self._active_scope.pareto_front()
+
+    def solutions(self, over=None, limit=None):
+        return self._active_scope.solutions(over, limit)
+
+    def concretize(self, minimize=None, maximize=None, model=None, decompose=False, pool=None, hints=None,
+                   lazy=False, only=None, where=None):
+        args = (minimize, maximize, model, decompose, pool, hints, lazy, only, where)
+        if not instrumentation.enabled:
+            return self._concretize(*args)
+        record = instrumentation.begin('concretize')
+        try:
+            return self._concretize(*args)
+        finally:
+            instrumentation.end(record)
+
+    def materialize(self, symbols):
+        # Concretize now the given symbols of a lazy concretization.
+        for symbol in symbols:
+            if isinstance(symbol, Symbol):
+                symbol.materialize()
 
-    def concretize(self, minimize=None, maximize=None):
+    def _concretize(self, minimize, maximize, model, decompose, pool, hints, lazy, only, where):
 
         if not self.concretization_enabled:
             raise Exception('Cannot concretize: concretization was disabled.')
 
+        if only is not None:
+            children = set(id(c) for c in self._children)
+            if not all(id(symbol) in children for symbol in only):
+                raise Exception('Cannot concretize: only symbols of the active scope can be selected.')
+
         if not minimize is None:
             self.minimize(minimize)
 
         if not maximize is None:
             self.maximize(maximize)
 
-        # We first obtain a model given the current constraints.
-        model = self.model().backend_model
+        # We first obtain a model given the current constraints, unless
+        # one was given (e.g. one of the improving models of an optimizer).
+        # If requested, independent groups of constraints are solved separately,
+        # in parallel if an executor (e.g. a ThreadPoolExecutor) is given as pool.
+        # Hints (a previous model, or a dictionary from symbols to values) steer
+        # the solver towards a nearby solution.
+        if model is None:
+            with instrumentation.phase('solve'):
+                model = self.model(decompose, pool, hints)
+        model = model.backend_model
         # We then concretize all non concretized children for which there
-        # is a solution in the model.
-        for child in [c for c in self._children if not c.concretized]:
-            # We only concretize with the given model if there is an actual solution
-            # for this child's symbolic variable in the model.
-            if model[child.symbol] != None:
-                child.concretize(model)
-                # Additionally impose the equality restriction.
-                # NOTE: Z3 does not seem to allow concretizing functions,
-                # thus concrete value constraints are only imposed for non functions.
-                if not child.is_function:
-                    self._active_scope.concretize(child, model)
+        # is a solution in the model. If lazy, symbols are only concretized
+        # (and their values pinned) once they are first used, functions aside.
+        # Children may be restricted to the given ones (only) and to those
+        # satisfying a predicate (where), leaving the rest symbolic for later
+        # solves of the same scope.
+        children = self._children
+        if only is not None:
+            selected = set(id(symbol) for symbol in only)
+            children = [c for c in children if id(c) in selected]
+        if where is not None:
+            children = [c for c in children if where(c)]
+        with instrumentation.phase('extraction'):
+            for child in [c for c in children if not c.concretized]:
+                if lazy and not child.is_function:
+                    self._active_scope.concretize_lazily(child, model)
+                    continue
+                # We only concretize with the given model if there is an actual solution
+                # for this child's symbolic variable in the model.
+                if model[child.symbol] != None:
+                    child.concretize(model)
+                    # Additionally impose the equality restriction.
+                    # NOTE: Z3 does not seem to allow concretizing functions,
+                    # thus concrete value constraints are only imposed for non functions.
+                    if not child.is_function:
+                        self._active_scope.concretize(child, model)
 
         # Just return the model.
         return model
@@ -85,43 +223,89 @@ class Front:
     def wrap_concrete(self, value):
         return ConcreteWrapper(value)
 
+    def real_vector(self, reals, model=None):
+        # Values of many reals at once, as a float vector. The model may be one
+        # returned by model() or by concretize(), and defaults to the one the
+        # reals were concretized with.
+        if isinstance(model, Model):
+            model = model.backend_model
+        return real_vector(reals, model)
+
     def symbolic_int_array(self, basename='arr'):
-        symbol = backend.symbolic_int_array(basename)
-        object = SymbolicArray(str(symbol), symbol, datatype=SymbolicInteger)
+        return self.symbolic_array(basename)
+
+    def symbolic_array(self, basename='arr', index=int, element=int):
+        index = self._as_sort(index)
+        element = self._as_sort(element)
+        symbol = backend.symbolic_array(basename, index.symbol, element.symbol)
+        object = SymbolicArray(str(symbol), symbol, datatype=self._datatype(element))
         # Keep track of the child only if concretization is enabled.
-        if self.concretization_enabled: self._children.append(object)
+        if self.concretization_enabled: self._active_scope.register(object)
         return object
 
+    def constant_array(self, value, index=int, element=int):
+        index = self._as_sort(index)
+        element = self._as_sort(element)
+        symbol = backend.constant_array(index.symbol, element.symbol, value)
+        # Constant arrays have no unknowns, so there is nothing to concretize.
+        return SymbolicArray(str(symbol), symbol, datatype=self._datatype(element))
+
+    def int_sort(self):
+        return Sort('Int', backend.int_sort(), kind='int')
+
+    def bool_sort(self):
+        return Sort('Bool', backend.bool_sort(), kind='bool')
+
+    def real_sort(self):
+        return Sort('Real', backend.real_sort(), kind='real')
+
+    def bitvec_sort(self, bits):
+        return Sort('BitVec({})'.format(bits), backend.bitvec_sort(bits), kind='bitvec')
+
     def symbolic_int(self, basename='int'):
         symbol = backend.symbolic_int(basename)
         object = SymbolicInteger(str(symbol), symbol)
         # Keep track of the child only if concretization is enabled.
-        if self.concretization_enabled: self._children.append(object)
+        if self.concretization_enabled: self._active_scope.register(object)
         return object
 
     def symbolic_bool(self, basename='bool'):
         symbol = backend.symbolic_bool(basename)
         object = SymbolicBool(str(symbol), symbol)
         # Keep track of the child only if concretization is enabled.
-        if self.concretization_enabled: self._children.append(object)
+        if self.concretization_enabled: self._active_scope.register(object)
         return object
 
     def symbolic_real(self, basename='real', precision=6):
         symbol = backend.symbolic_real(basename)
         object = SymbolicReal(str(symbol), symbol, precision=precision)
         # Keep track of the child only if concretization is enabled.
-        if self.concretization_enabled: self._children.append(object)
+        if self.concretization_enabled: self._active_scope.register(object)
         return object
 
     def sort(self, name):
         symbol = backend.declare_sort(name)
         return Sort(name, symbol)
 
+    def enum_sort(self, name, members):
+        # Declarations are kept, like those of the backend, so that declaring
+        # the same sort again gives back the same Python enumeration.
+        members = list(members)
+        symbol, values = backend.enum_sort(name, members)
+        sort = self._enum_sorts.get(name)
+        if sort is None:
+            enumeration = enum.Enum(name, members, type=EnumValue)
+            for member, value in zip(enumeration, values):
+                member._symbol = value
+                backend.register_value(value, member)
+            sort = self._enum_sorts[name] = EnumSort(name, symbol, enumeration)
+        return sort
+
     def symbolic(self, name, sort):
         symbol = backend.symbolic(name, sort.symbol)
         object = SymbolicObject(str(symbol), symbol, sort)
         # Keep track of the child only if concretization is enabled.
-        if self.concretization_enabled: self._children.append(object)
+        if self.concretization_enabled: self._active_scope.register(object)
         return object
 
     def uninterpreted_function(self, name, *sorts):
@@ -133,7 +317,7 @@ class Front:
         object = ConcretizableFunction(name, f)
         # We then register the function object for eventual concretization,
         # but only if concretization is enabled.
-        if self.concretization_enabled:  self._children.append(object)
+        if self.concretization_enabled: self._active_scope.register(object)
         # Then we just return the object.
         return object
 
@@ -145,6 +329,20 @@ class Front:
     def _children(self):
         return self._active_scope.children
 
+    def _as_sort(self, sort):
+        # Allow Python types to be used in place of built-in sorts.
+        if sort is int: return self.int_sort()
+        if sort is bool: return self.bool_sort()
+        if sort is float: return self.real_sort()
+        return sort
+
+    def _datatype(self, sort):
+        # Symbolic type used to wrap values of the given sort.
+        if sort.kind in ('int', 'bitvec'): return SymbolicInteger
+        if sort.kind == 'bool': return SymbolicBool
+        if sort.kind == 'real': return SymbolicReal
+        return functools.partial(SymbolicObject, sort=sort)
+
     def _scope(self, backend_scope):
         scope = FrontScope(self, backend, backend_scope)
         self._transient_scopes.append(scope)
@@ -186,6 +384,23 @@ class Model:
     def __repr__(self):
         return self.backend_model.__repr__()
 
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class Objective:
+
+    def __init__(self, backend_objective, backend):
+        self._backend_objective = backend_objective
+        self._backend = backend
+
+    @property
+    def value(self):
+        # Optimal value of the objective, available after solving. In box mode,
+        # each objective is optimized independently of the others.
+        return self._backend.objective_value(self._backend_objective)
+
+    def __repr__(self):
+        return self.value.__repr__()
+
 #==================================================================================================
 #--------------------------------------------------------------------------------------------------
 class FrontScope:
@@ -194,11 +409,18 @@ class FrontScope:
         self._frontend = frontend
         self._backend = backend
         self._backend_scope = backend_scope
-        self._symbols = []
+        # Children are only weakly referenced, so that symbols that are
+        # dropped by the user before concretization may be garbage collected.
+        self._symbols = weakref.WeakValueDictionary()
+        # Number of times the scope has been solved.
+        self._generation = 0
 
     @property
     def children(self):
-        return self._symbols
+        return list(self._symbols.values())
+
+    def register(self, child):
+        self._symbols[id(child)] = child
 
     @property
     def assertions(self):
@@ -216,26 +438,176 @@ class FrontScope:
 
     def concretize(self, variable, model):
         self._backend_scope.add(variable.symbol == model[variable.symbol])
-        # Remove variable from children to allow for eventual garbage collection.
-        # TODO: Should this be made configurable?
-        self.children.remove(variable)
+        # Remove variable from children, it does not need to be tracked anymore.
+        self._symbols.pop(id(variable), None)
+
+    def concretize_lazily(self, variable, model):
+        # Concretize and pin the variable once it is first used, unless the
+        # scope has been solved again in between. Its value in the older model
+        # was never observed then, and the variable is left symbolic instead.
+        generation = self._generation
+        def resolve(variable, model):
+            if generation == self._generation and model[variable.symbol] != None:
+                variable.concretize(model)
+                self.concretize(variable, model)
+        variable.concretize_lazily(model, resolve)
 
     def minimize(self, expression):
-        self._backend.minimize(expression.value)
+        return Objective(self._backend.minimize(expression.value), self._backend)
 
     def maximize(self, expression):
-        self._backend.maximize(expression.value)
+        return Objective(self._backend.maximize(expression.value), self._backend)
+
+    def on_model(self, callback):
+        self._backend_scope.on_model(lambda model: callback(Model(model, self._backend)))
+
+    def solutions(self, over=None, limit=None):
+        # Enumerate up to limit distinct solutions, projected onto the given
+        # symbols or expressions (all non concretized primitive children by
+        # default). Blocking clauses are conditioned on an indicator literal
+        # that is assumed in each check, so that the same solver is reused
+        # throughout, and they are retired along with it once the enumeration
+        # is over. Constraints required between iterations remain in the scope.
+        if over is None:
+            over = [c for c in self.children if not c.is_function and not isinstance(c, SymbolicArray)]
+        expressions = [o.value for o in over if not is_concrete_like(o)]
+        scope = self._backend_scope
+        self._generation += 1
+        literal = scope.indicator('solutions')
+        try:
+            count = 0
+            while limit is None or count < limit:
+                if not scope.check_sat(literal):
+                    return
+                model = scope.model()
+                yield Model(model, self._backend)
+                count += 1
+                if not expressions:
+                    return
+                scope.block(literal, model, expressions)
+        finally:
+            scope.retire(literal)
+
+    def improving_models(self, timeout=None):
+        self._generation += 1
+        for model in self._backend_scope.improving_models(timeout):
+            yield Model(model, self._backend)
+
+    def pareto_front(self):
+        self._generation += 1
+        for model in self._backend_scope.pareto_front():
+            yield Model(model, self._backend)
 
     def check_sat(self):
+        # If unsatisfiable, the labels involved are available from unsat_core.
+        self._generation += 1
         sat, model = self._backend.check_sat()
         return sat, (Model(model, self._backend) if sat else None)
 
-    def model(self):
-        return Model(self._backend.model(), self._backend)
+    def unsat_core(self, minimize=False):
+        return self._backend_scope.unsat_core(minimize)
+
+    def relax(self, label):
+        self._backend_scope.relax(label)
+
+    def enforce(self, label):
+        self._backend_scope.enforce(label)
+
+    def check_with(self, bindings):
+        # Check satisfiability with the given symbols bound to the given values,
+        # without keeping the bindings afterwards.
+        self._generation += 1
+        sat, model = self._backend_scope.check_with(bindings)
+        return sat, (Model(model, self._backend) if sat else None)
+
+    def model(self, decompose=False, pool=None, hints=None):
+        if isinstance(hints, Model):
+            hints = hints.backend_model
+        elif isinstance(hints, dict):
+            hints = [(symbol.value, do_evaluate(value))
+                for symbol, value in hints.items() if not is_concrete_like(symbol)]
+        self._generation += 1
+        return Model(self._backend.model(decompose, pool, hints), self._backend)
+
+    def export(self, path=None):
+        smt2, manifest = self._backend.export()
+        manifest['symbols'] = [
+            {'name': self._backend.name(child.symbol), 'type': type(child).__name__}
+            for child in self.children]
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(smt2)
+            with open(path + '.json', 'w') as f:
+                json.dump(manifest, f, indent=2)
+        return smt2, manifest
+
+    def import_model(self, values):
+        return Model(self._backend.import_model(values), self._backend)
 
     def __enter__(self):
         self._backend_scope.__enter__()
 
     def __exit__(self, type, value, traceback):
         self._backend_scope.__exit__(type, value, traceback)
-        self._frontend.exit_scope()
\ No newline at end of file
+        self._frontend.exit_scope()
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class AssumptionScope:
+
+    # Constraints required within the scope are guarded by an indicator literal,
+    # which is assumed on every check until the scope is left.
+    def __init__(self, backend):
+        self._backend = backend
+
+    def __enter__(self):
+        self._backend.enter_assumptions()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self._backend.exit_assumptions()
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class Template:
+
+    # A model building function traced once into backend assertions, in a scope of
+    # its own. While tracing, the parameters of the function are symbolic placeholders
+    # (integers, unless annotated as bool or float). Calling the template binds them
+    # to concrete values and solves, reusing the same solver every time, and without
+    # building or lowering the model again.
+    def __init__(self, frontend, function):
+        # Imported here, since inspect is comparatively slow to import.
+        import inspect
+        parameters = inspect.signature(function).parameters
+        self._scope = frontend.scope()
+        with self._scope:
+            self._parameters = {
+                name: self._placeholder(frontend, name, parameter.annotation)
+                for name, parameter in parameters.items()
+            }
+            self._outputs = function(**self._parameters)
+
+    @property
+    def parameters(self):
+        return self._parameters
+
+    @property
+    def outputs(self):
+        # Whatever the traced function returned, to be evaluated in the models
+        # produced by the template.
+        return self._outputs
+
+    def __call__(self, **bindings):
+        for name in bindings:
+            if not name in self._parameters:
+                raise Exception('Unknown template parameter {}'.format(name))
+        bindings = [(self._parameters[name].symbol, do_evaluate(value)) for name, value in bindings.items()]
+        return self._scope.check_with(bindings)
+
+    def _placeholder(self, frontend, name, annotation):
+        if annotation is bool:
+            return frontend.symbolic_bool(name)
+        if annotation is float:
+            return frontend.symbolic_real(name)
+        return frontend.symbolic_int(name)
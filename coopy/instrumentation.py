@@ -0,0 +1,139 @@
+import collections
+import time
+import weakref
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class Record:
+
+    # Counts, accumulated phase times (in seconds) and the latest solver
+    # statistics, for a scope or a single call.
+    def __init__(self, name):
+        self.name = name
+        self.counts = collections.Counter()
+        self.times = collections.defaultdict(float)
+        self.statistics = {}
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'counts': dict(self.counts),
+            'times': dict(self.times),
+            'statistics': dict(self.statistics)
+        }
+
+    def __repr__(self):
+        return self.as_dict().__repr__()
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class Phase:
+
+    def __init__(self, instrumentation, name):
+        self._instrumentation = instrumentation
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, type, value, traceback):
+        self._instrumentation.add_time(self._name, time.perf_counter() - self._start)
+
+class NullPhase:
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, type, value, traceback):
+        pass
+
+_NULL_PHASE = NullPhase()
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class Instrumentation:
+
+    # Opt-in counters and timers for the phases of building and solving models.
+    # Call sites check the enabled flag first, so that the cost is negligible
+    # while disabled.
+    def __init__(self):
+        self.enabled = False
+        self.totals = Record('total')
+        # Records of the calls currently in progress, innermost last.
+        self._open = []
+        self._scopes = weakref.WeakKeyDictionary()
+        self._scope_provider = None
+        self._hooks = []
+        # Records of the latest completed calls.
+        self.calls = collections.deque(maxlen=1024)
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.totals = Record('total')
+        self._open = []
+        self._scopes = weakref.WeakKeyDictionary()
+        self.calls.clear()
+
+    def set_scope_provider(self, provider):
+        # Function returning the active backend scope, under which counts and
+        # times are additionally recorded.
+        self._scope_provider = provider
+
+    def scope(self, scope=None):
+        # Record of the given backend scope, or of the active one by default.
+        if scope is None:
+            scope = self._scope_provider() if self._scope_provider else None
+        if scope is None:
+            return None
+        record = self._scopes.get(scope)
+        if record is None:
+            record = self._scopes[scope] = Record('scope')
+        return record
+
+    def add_hook(self, hook):
+        # Hooks are called as hook(event, record) whenever a call completes,
+        # with events 'check' and 'concretize'.
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self._hooks.remove(hook)
+
+    def _records(self):
+        records = [self.totals] + self._open
+        scope = self.scope()
+        if scope is not None:
+            records.append(scope)
+        return records
+
+    def count(self, name, amount=1):
+        for record in self._records():
+            record.counts[name] += amount
+
+    def add_time(self, name, seconds):
+        for record in self._records():
+            record.times[name] += seconds
+
+    def add_statistics(self, statistics):
+        for record in self._records():
+            record.statistics.update(statistics)
+
+    def phase(self, name):
+        return Phase(self, name) if self.enabled else _NULL_PHASE
+
+    def begin(self, name):
+        record = Record(name)
+        self._open.append(record)
+        return record
+
+    def end(self, record):
+        self._open.remove(record)
+        self.calls.append(record)
+        for hook in self._hooks:
+            hook(record.name, record)
+
+instrumentation = Instrumentation()
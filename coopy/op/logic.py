@@ -3,6 +3,7 @@ from .operator import UnaryOperator, BinaryOperator
 from ..symbolic import concretizable, is_concrete_like, do_evaluate
 from ..smt.constraint import Constraint
 from ..smt import backend
+from ..instrumentation import instrumentation
 
 #==================================================================================================
 #
@@ -124,34 +125,64 @@ class EmptyPredicate(Predicate):
     def value(self):
         return True
 
-class ForAll(Predicate):
+class Quantifier(Predicate):
 
-    def __init__(self, bound_variables, predicate):
+    # Instantiation of the quantifier may be steered with patterns (terms, or
+    # tuples of terms for multi-patterns), a weight and an identifier (qid).
+    # Alternatively, given a finite domain of values for all bound variables
+    # (domain) or for each of them (domains), the quantifier is expanded over
+    # all combinations of values instead, without quantifying at all.
+    def __init__(self, bound_variables, predicate, patterns=None, weight=1, qid=None,
+                 domain=None, domains=None):
+        if instrumentation.enabled: instrumentation.count('nodes')
         self._bound = [do_evaluate(v) for v in bound_variables]
         self._predicate = predicate
+        self._patterns = patterns or []
+        self._weight = weight
+        self._qid = qid
+        if domain is not None:
+            domains = [domain] * len(self._bound)
+        if domains is not None and len(domains) != len(self._bound):
+            raise Exception('Expected one domain per bound variable')
+        self._domains = domains
 
     @property
     def value(self):
-        return backend.forall(self._bound, do_evaluate(self._predicate))
+        if instrumentation.enabled: instrumentation.count('lowered')
+        body = do_evaluate(self._predicate)
+        if self._domains is not None:
+            domains = [[do_evaluate(v) for v in domain] for domain in self._domains]
+            return self._expand(self._bound, body, domains)
+        patterns = [[do_evaluate(t) for t in (p if isinstance(p, (list, tuple)) else [p])]
+            for p in self._patterns]
+        return self._quantify(self._bound, body, patterns, self._weight, self._qid)
 
-class Exists(Predicate):
+class ForAll(Quantifier):
 
-    def __init__(self, bound_variables, predicate):
-        self._bound = [do_evaluate(v) for v in bound_variables]
-        self._predicate = predicate
+    def _quantify(self, *args):
+        return backend.forall(*args)
 
-    @property
-    def value(self):
-        return backend.exists(self._bound, do_evaluate(self._predicate))
+    def _expand(self, bound, body, domains):
+        return backend.expand(bound, body, domains, universal=True)
+
+class Exists(Quantifier):
+
+    def _quantify(self, *args):
+        return backend.exists(*args)
+
+    def _expand(self, bound, body, domains):
+        return backend.expand(bound, body, domains, universal=False)
 
 class Implies(Predicate):
 
     def __init__(self, antecedent, consequent):
+        if instrumentation.enabled: instrumentation.count('nodes')
         self._a = antecedent
         self._c = consequent
 
     @property
     def value(self):
+        if instrumentation.enabled: instrumentation.count('lowered')
         antecedent = do_evaluate(self._a)
         consequent = do_evaluate(self._c)
         return backend.implies(antecedent, consequent)
@@ -159,13 +190,15 @@ class Implies(Predicate):
 class Iff(Predicate):
 
     def __init__(self, a, b):
+        if instrumentation.enabled: instrumentation.count('nodes')
         self._a = a
         self._b = b
 
     @property
     def value(self):
+        if instrumentation.enabled: instrumentation.count('lowered')
         a = do_evaluate(self._a)
-        b = do_evaluate(self._c)
+        b = do_evaluate(self._b)
         return backend.iff(a, b)
 
 class Not(UnaryOperator, Predicate):
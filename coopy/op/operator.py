@@ -1,10 +1,12 @@
 from ..symbolic import Evaluable, is_evaluable, do_evaluate
+from ..instrumentation import instrumentation
 
 #==================================================================================================
 #--------------------------------------------------------------------------------------------------
 class UnaryOperator(Evaluable):
 
     def __init__(self, arg, op):
+        if instrumentation.enabled: instrumentation.count('nodes')
         self._arg = arg
         self._op = op
 
@@ -18,6 +20,7 @@ class UnaryOperator(Evaluable):
 
     @property
     def value(self):
+        if instrumentation.enabled: instrumentation.count('lowered')
         return self._op(self.arg_value)
 
     @property
@@ -29,6 +32,7 @@ class UnaryOperator(Evaluable):
 class BinaryOperator(Evaluable):
 
     def __init__(self, arg1, arg2, op):
+        if instrumentation.enabled: instrumentation.count('nodes')
         self._a1 = arg1
         self._a2 = arg2
         self._op = op
@@ -51,6 +55,7 @@ class BinaryOperator(Evaluable):
 
     @property
     def value(self):
+        if instrumentation.enabled: instrumentation.count('lowered')
         return self._op(self.left_value, self.right_value)
 
     @property
@@ -2,16 +2,19 @@ from ..smt import backend
 from .logic import Predicate
 from .arithmetic import ConcretizableArithmeticOperand
 from ..symbolic import do_evaluate
+from ..instrumentation import instrumentation
 
 class ITE(Predicate, ConcretizableArithmeticOperand):
 
     def __init__(self, guard, true_case, false_case):
+        if instrumentation.enabled: instrumentation.count('nodes')
         self._guard = guard
         self._t = true_case
         self._f = false_case
 
     @property
     def value(self):
+        if instrumentation.enabled: instrumentation.count('lowered')
         g = do_evaluate(self._guard)
         t = do_evaluate(self._t)
         f = do_evaluate(self._f)
@@ -1,7 +1,53 @@
-from .z3 import Z3Backend
+from .base import Backend
 
-backend = Z3Backend()
+import types
 
-from .z3 import to_int as backend_int_to_int
-from .z3 import to_bool as backend_bool_to_bool
-from .z3 import to_obj as backend_obj_to_obj
\ No newline at end of file
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class LazyBackend:
+
+    # Stand-in for the backend, which is only created (and Z3 only imported)
+    # on first use. Bound methods are cached on the proxy itself, so that
+    # later calls do not go through __getattr__ again.
+    def __init__(self):
+        object.__setattr__(self, '_instance', None)
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def _load(self):
+        if self._instance is None:
+            from .z3 import Z3Backend
+            object.__setattr__(self, '_instance', Z3Backend())
+        return self._instance
+
+    def __getattr__(self, name):
+        attribute = getattr(self._load(), name)
+        if isinstance(attribute, types.MethodType):
+            object.__setattr__(self, name, attribute)
+        return attribute
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+backend = LazyBackend()
+
+def backend_int_to_int(value):
+    from .z3 import to_int
+    return to_int(value)
+
+def backend_bool_to_bool(value):
+    from .z3 import to_bool
+    return to_bool(value)
+
+def backend_real_to_fraction(value, precision=6):
+    from .z3 import to_fraction
+    return to_fraction(value, precision)
+
+def backend_obj_to_obj(value):
+    return backend.to_obj(value)
+
+def solve_smtlib(smt2, manifest=None):
+    from .z3 import solve_smtlib
+    return solve_smtlib(smt2, manifest)
@@ -0,0 +1,258 @@
+import abc
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class Backend(abc.ABC):
+
+    # Interface expected from backends by the front-end, the operators and the
+    # symbolic types. Terms, sorts, models and scopes are opaque objects that
+    # are only ever handed back to the same backend.
+
+    # Scopes and solving.
+    @property
+    @abc.abstractmethod
+    def default_scope(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def reset(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def minimize(self, expression):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def maximize(self, expression):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def objective_value(self, objective):
+        raise NotImplementedError
+
+    @property
+    @abc.abstractmethod
+    def cache(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def enable_cache(self, maxsize=128, directory=None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def disable_cache(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def check_sat(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def model(self, decompose=False, pool=None, hints=None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def unsat_core(self, minimize=False):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def relax(self, label):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def enforce(self, label):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def export(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def import_model(self, values):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def name(self, symbol):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def push(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def pop(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def add(self, constraint, label=None, origin=None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def soft(self, constraint, weight=1, group=None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def enter_assumptions(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def exit_assumptions(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def declare_sort(self, name):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def enum_sort(self, name, members):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def register_value(self, symbol, value):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def to_obj(self, value):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def scope(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def optimizer(self, priority=None, maxsat=None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def exit_scope(self):
+        raise NotImplementedError
+
+    # Construction of symbols and terms.
+    @abc.abstractmethod
+    def symbolic(self, basename, sort):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def symbolic_int(self, basename):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def symbolic_bool(self, basename):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def symbolic_real(self, basename):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def symbolic_int_array(self, basename):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def symbolic_array(self, basename, index_sort, element_sort):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def constant_array(self, index_sort, element_sort, value):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def store(self, array, entries):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def range_equal(self, array, entries):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def select(self, array, index):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def int_sort(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def bool_sort(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def real_sort(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def bitvec_sort(self, bits):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def conjunction(self, *args):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def disjunction(self, *args):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def negation(self, *args):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def forall(self, bound, body, patterns=(), weight=1, qid=None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def exists(self, bound, body, patterns=(), weight=1, qid=None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def expand(self, bound, body, domains, universal=True):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def implies(self, antecedent, consequent):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def ite(self, guard, true_case, false_case):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iff(self, a, b):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def uninterpreted_function(self, basename, *sorts):
+        raise NotImplementedError
+
+    # Evaluation in models.
+    @abc.abstractmethod
+    def evaluate_in_model(self, expression, own_model, handler, precision=6):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def real_values(self, own_model, symbols, precision=6):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def evaluate_array(self, own_model, array):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def evaluate_uninterpreted(self, f, *args):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def evaluate_function_call(self, model, f, *args):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def function_table(self, model, f):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def value_key(self, args):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def is_custom_value(self, value):
+        raise NotImplementedError
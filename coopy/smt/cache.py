@@ -0,0 +1,70 @@
+import collections
+import os
+import shelve
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class ResultCache:
+
+    def __init__(self, maxsize=128, directory=None):
+        # Most recently used entries are kept at the end.
+        self._entries = collections.OrderedDict()
+        self._maxsize = maxsize
+        # Optional on-disk tier, shared between processes using the same directory.
+        self._disk = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._disk = shelve.open(os.path.join(directory, 'coopy-cache'))
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def statistics(self):
+        return {
+            'hits': self._hits,
+            'disk_hits': self._disk_hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'size': len(self._entries)
+        }
+
+    def get(self, key):
+        try:
+            value = self._entries[key]
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+        except KeyError:
+            pass
+        if self._disk is not None and key in self._disk:
+            value = self._disk[key]
+            self._store(key, value)
+            self._hits += 1
+            self._disk_hits += 1
+            return value
+        self._misses += 1
+        return None
+
+    def put(self, key, value):
+        self._store(key, value)
+        if self._disk is not None:
+            self._disk[key] = value
+
+    def clear(self):
+        self._entries.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
@@ -1,18 +1,21 @@
 from ..symbolic import Evaluable
 from . import backend
+from ..instrumentation import instrumentation
 
 import functools
 
 class Constraint(Evaluable):
 
-    def impose(self):
-        backend.add(self.value)
+    def impose(self, label=None):
+        with instrumentation.phase('lowering'):
+            value = self.value
+        backend.add(value, label=label, origin=self)
 
-    def require(self):
-        self.impose()
+    def require(self, label=None):
+        self.impose(label)
 
-    def soft(self, weight=1):
-        backend.soft(self.value, weight=weight)
+    def soft(self, weight=1, group=None):
+        backend.soft(self.value, weight=weight, group=group)
 
     @property
     def has_concrete_value(self):
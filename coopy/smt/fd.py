@@ -0,0 +1,259 @@
+#
+# Finite domain engine: a small pure Python solver for models made up of a few
+# bounded integer and boolean variables, for which the setup cost of a full SMT
+# solver dominates the actual search. Constraints are given as terms, i.e.
+# nested tuples (operator, *arguments), with ('var', index) for variables and
+# ('const', value) for constants.
+#
+import functools
+import operator
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+
+def solve(terms, kinds, max_domain=256, max_checks=20000):
+    # Find values for variables of the given kinds ('int' or 'bool'), indexed
+    # in order, that satisfy all of the terms. Returns the list of values, False
+    # if there is no solution, or None if the problem is not a finite domain one
+    # (i.e. an integer variable is unbounded or its domain is too large) or if
+    # the search gives up after max_checks evaluations of constraints.
+    conjuncts = _conjuncts(terms)
+    domains = _domains(conjuncts, kinds, max_domain)
+    if domains is None:
+        return None
+    constraints = []
+    for term in conjuncts:
+        variables = _variables(term)
+        if not variables:
+            if not _compile(term)(None):
+                return False
+        else:
+            constraints.append((_compile(term), variables))
+    if any(not domain for domain in domains):
+        return False
+    return _search(domains, constraints, max_checks)
+
+def _conjuncts(terms):
+    output, stack = [], list(reversed(terms))
+    while stack:
+        term = stack.pop()
+        if term[0] == 'and':
+            stack.extend(reversed(term[1:]))
+        else:
+            output.append(term)
+    return output
+
+#--------------------------------------------------------------------------------------------------
+# Domains
+
+def _domains(conjuncts, kinds, max_domain):
+    lower = [None] * len(kinds)
+    upper = [None] * len(kinds)
+    allowed = [None] * len(kinds)
+    for term in conjuncts:
+        bound = _unary_bound(term)
+        if bound is None:
+            continue
+        index, low, high, values = bound
+        if low is not None:
+            lower[index] = low if lower[index] is None else max(lower[index], low)
+        if high is not None:
+            upper[index] = high if upper[index] is None else min(upper[index], high)
+        if values is not None:
+            allowed[index] = values if allowed[index] is None else allowed[index] & values
+    domains = []
+    for i, kind in enumerate(kinds):
+        if kind == 'bool':
+            domains.append([False, True])
+            continue
+        if allowed[i] is not None:
+            values = sorted(v for v in allowed[i]
+                if (lower[i] is None or v >= lower[i]) and (upper[i] is None or v <= upper[i]))
+        elif lower[i] is None or upper[i] is None or upper[i] - lower[i] >= max_domain:
+            return None
+        else:
+            values = list(range(lower[i], upper[i] + 1))
+        if len(values) > max_domain:
+            return None
+        domains.append(values)
+    return domains
+
+def _unary_bound(term):
+    # Bounds (index, lower, upper, values) given by comparisons of a variable to
+    # a constant, or by disjunctions of equalities of a variable to constants.
+    negated = term[0] == 'not'
+    if negated:
+        term = term[1]
+    op = term[0]
+    if op in ('le', 'lt', 'ge', 'gt', 'eq') and len(term) == 3:
+        a, b = term[1], term[2]
+        if a[0] == 'const' and b[0] == 'var':
+            a, b = b, a
+            op = {'le': 'ge', 'lt': 'gt', 'ge': 'le', 'gt': 'lt', 'eq': 'eq'}[op]
+        if a[0] != 'var' or b[0] != 'const' or type(b[1]) != int:
+            return None
+        if negated:
+            if op == 'eq':
+                return None
+            op = {'le': 'gt', 'lt': 'ge', 'ge': 'lt', 'gt': 'le'}[op]
+        index, c = a[1], b[1]
+        if op == 'eq':
+            return index, None, None, {c}
+        if op == 'le':
+            return index, None, c, None
+        if op == 'lt':
+            return index, None, c - 1, None
+        if op == 'ge':
+            return index, c, None, None
+        return index, c + 1, None, None
+    if op == 'or' and not negated:
+        index, values = None, set()
+        for equality in term[1:]:
+            bound = _unary_bound(equality)
+            if bound is None or bound[3] is None or (index is not None and bound[0] != index):
+                return None
+            index = bound[0]
+            values |= bound[3]
+        return (index, None, None, values) if index is not None else None
+    return None
+
+#--------------------------------------------------------------------------------------------------
+# Terms
+
+def _variables(term):
+    output, stack = set(), [term]
+    while stack:
+        term = stack.pop()
+        if term[0] == 'var':
+            output.add(term[1])
+        elif term[0] != 'const':
+            stack.extend(term[1:])
+    return output
+
+_BINARY = {
+    'le': operator.le, 'lt': operator.lt, 'ge': operator.ge, 'gt': operator.gt,
+    'sub': operator.sub
+}
+
+def _compile(term):
+    # Turn a term into a function of the assignment (a list of values).
+    op = term[0]
+    if op == 'const':
+        value = term[1]
+        return lambda a: value
+    if op == 'var':
+        index = term[1]
+        return lambda a: a[index]
+    args = [_compile(t) for t in term[1:]]
+    if op == 'not':
+        f = args[0]
+        return lambda a: not f(a)
+    if op == 'uminus':
+        f = args[0]
+        return lambda a: -f(a)
+    if op in _BINARY:
+        f, g, binary = args[0], args[1], _BINARY[op]
+        if len(args) > 2:
+            return lambda a: functools.reduce(binary, [h(a) for h in args])
+        return lambda a: binary(f(a), g(a))
+    if op == 'eq':
+        f, g = args
+        return lambda a: f(a) == g(a)
+    if op == 'distinct':
+        return lambda a: len(set(f(a) for f in args)) == len(args)
+    if op == 'and':
+        return lambda a: all(f(a) for f in args)
+    if op == 'or':
+        return lambda a: any(f(a) for f in args)
+    if op == 'implies':
+        f, g = args
+        return lambda a: (not f(a)) or g(a)
+    if op == 'iff':
+        f, g = args
+        return lambda a: bool(f(a)) == bool(g(a))
+    if op == 'xor':
+        f, g = args
+        return lambda a: bool(f(a)) != bool(g(a))
+    if op == 'ite':
+        c, f, g = args
+        return lambda a: f(a) if c(a) else g(a)
+    if op == 'add':
+        return lambda a: sum(f(a) for f in args)
+    if op == 'mul':
+        return lambda a: functools.reduce(operator.mul, [f(a) for f in args])
+    raise Exception('Unsupported operator: {}'.format(op))
+
+#--------------------------------------------------------------------------------------------------
+# Search
+
+class _Exhausted(Exception):
+    pass
+
+def _search(domains, constraints, max_checks):
+    # Backtracking over the variable with the smallest domain first, filtering
+    # the domains of variables that become the last unassigned one of any of
+    # their constraints (forward checking). There is no bound propagation for
+    # anything else, so that the search is given up after max_checks evaluations
+    # of constraints rather than going through the whole product of the domains.
+    count = len(domains)
+    watching = [[] for i in range(count)]
+    for constraint in constraints:
+        for index in constraint[1]:
+            watching[index].append(constraint)
+    assignment = [None] * count
+    assigned = [False] * count
+    checks = [0]
+
+    def spend(amount):
+        checks[0] += amount
+        if max_checks is not None and checks[0] > max_checks:
+            raise _Exhausted()
+
+    def propagate(index, domains):
+        for check, variables in watching[index]:
+            pending = [v for v in variables if not assigned[v]]
+            if not pending:
+                spend(1)
+                if not check(assignment):
+                    return None
+            elif len(pending) == 1:
+                other = pending[0]
+                spend(len(domains[other]))
+                values = []
+                assigned[other] = True
+                for value in domains[other]:
+                    assignment[other] = value
+                    if check(assignment):
+                        values.append(value)
+                assigned[other] = False
+                assignment[other] = None
+                if not values:
+                    return None
+                if len(values) < len(domains[other]):
+                    domains = list(domains)
+                    domains[other] = values
+        return domains
+
+    def backtrack(domains, remaining):
+        if not remaining:
+            return True
+        index = min(remaining, key=lambda i: len(domains[i]))
+        remaining = [i for i in remaining if i != index]
+        for value in domains[index]:
+            assignment[index] = value
+            assigned[index] = True
+            narrowed = list(domains)
+            narrowed[index] = [value]
+            narrowed = propagate(index, narrowed)
+            if narrowed is not None and backtrack(narrowed, remaining):
+                return True
+            assigned[index] = False
+            assignment[index] = None
+        return False
+
+    try:
+        if not backtrack(domains, list(range(count))):
+            return False
+    except _Exhausted:
+        return None
+    return assignment
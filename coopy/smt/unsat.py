@@ -0,0 +1,38 @@
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class UnsatCore:
+
+    # Labels of the constraints that take part in a conflict, each along with
+    # the predicates that were required under that label.
+    def __init__(self, entries):
+        self._entries = entries
+
+    @property
+    def labels(self):
+        return list(self._entries)
+
+    def __getitem__(self, label):
+        return self._entries[label]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, label):
+        return label in self._entries
+
+    def __repr__(self):
+        return self.labels.__repr__()
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class Unsatisfiable(Exception):
+
+    def __init__(self, core=None):
+        message = 'Unsatisfiable constraints'
+        if core:
+            message += ', conflicting labels: {}'.format(core)
+        super().__init__(message)
+        self.core = core
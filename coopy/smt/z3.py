@@ -1,12 +1,51 @@
-from z3 import *
+from z3 import (
+    And, Array, BitVecSort, BitVecVal, Bool, BoolSort, BoolVal, Const, Context, DeclareSort,
+    EnumSort, Exists, ForAll, Function, If, Implies, Int, IntSort, IntVal, K, MultiPattern, Not,
+    Optimize, Or, RatVal, Real, RealSort, Select, Solver, Store, Z3Exception, main_ctx, sat,
+    simplify, substitute, unsat, is_K, is_algebraic_value, is_app, is_bv_value, is_const, is_false, is_func_decl,
+    is_int_value, is_quantifier, is_rational_value, is_store, is_true)
+from z3 import (
+    Z3_APP_AST, Z3_BOOL_SORT, Z3_BV_SORT, Z3_DATATYPE_SORT, Z3_INT_SORT, Z3_OP_UNINTERPRETED,
+    Z3_QUANTIFIER_AST, Z3_REAL_SORT, Z3_UNINTERPRETED_SORT)
+from z3 import (
+    Z3_OP_AND, Z3_OP_OR, Z3_OP_NOT, Z3_OP_EQ, Z3_OP_DISTINCT, Z3_OP_LE, Z3_OP_LT, Z3_OP_GE,
+    Z3_OP_GT, Z3_OP_ADD, Z3_OP_SUB, Z3_OP_MUL, Z3_OP_UMINUS, Z3_OP_ITE, Z3_OP_IMPLIES,
+    Z3_OP_IFF, Z3_OP_XOR, Z3_OP_TRUE, Z3_OP_FALSE, Z3_NUMERAL_AST)
+from z3 import (
+    Z3_func_decl_to_ast, Z3_get_app_arg, Z3_get_app_decl, Z3_get_app_num_args, Z3_get_ast_id,
+    Z3_get_ast_kind, Z3_get_decl_kind, Z3_get_quantifier_body, Z3_get_quantifier_bound_sort,
+    Z3_get_quantifier_num_bound, Z3_get_sort, Z3_get_sort_kind, Z3_sort_to_ast, Z3_to_app,
+    Z3_get_numeral_double, Z3_get_numeral_string, Z3_is_numeral_ast)
+from z3.z3 import _to_expr_ref
+from .base import Backend
+from .cache import ResultCache
+from . import fd
+from .unsat import UnsatCore, Unsatisfiable
+from ..instrumentation import instrumentation
+
+import fractions
+import functools
+import hashlib
+import itertools
+import re
+import time
+import weakref
 
 #==================================================================================================
 #--------------------------------------------------------------------------------------------------
-class Z3Backend:
+class Z3Backend(Backend):
 
     def __init__(self):
         self._default_scope = Z3Scope(self, Solver())
+        instrumentation.set_scope_provider(lambda: self._active_scope)
         self._transient_scopes = []
+        self._cache = None
+        self._enum_sorts = {}
+        # Python objects standing for constants of enumerated sorts, keyed by
+        # AST id, and the other way around, keyed by object id. Both the objects
+        # and the constants (and thus their ids) are kept alive by the entries.
+        self._registered_values = {}
+        self._registered_symbols = {}
 
     @property
     def default_scope(self):
@@ -20,20 +59,234 @@ class Z3Backend:
         self._active_scope.reset()
 
     def minimize(self, expression):
-        self._active_scope.minimize(expression)
+        return self._active_scope.minimize(expression)
 
     def maximize(self, expression):
-        self._active_scope.maximize(expression)
+        return self._active_scope.maximize(expression)
+
+    def objective_value(self, objective):
+        value = objective.value()
+        if is_int_value(value) or is_rational_value(value) or is_bv_value(value):
+            return self.to_python(value)
+        # Unbounded objectives evaluate to terms involving infinity or epsilon.
+        return value
+
+    @property
+    def cache(self):
+        return self._cache
+
+    def enable_cache(self, maxsize=128, directory=None):
+        self.disable_cache()
+        self._cache = ResultCache(maxsize, directory)
+
+    def disable_cache(self):
+        if self._cache is not None:
+            self._cache.close()
+        self._cache = None
 
     def check_sat(self):
         scope = self._active_scope
+        if self._cache is not None and scope.cacheable:
+            return self._cached_check(scope)
+        output, model = self._solve(scope)
+        return output == sat, model
+
+    def model(self, decompose=False, pool=None, hints=None):
+        scope = self._active_scope
+        if decompose and not scope.is_optimizer:
+            if hints is not None:
+                raise Exception('Hints are not supported along with decompose.')
+            return self._decomposed_model(scope, pool)
+        if self._cache is not None and scope.cacheable and hints is None:
+            satisfiable, model = self._cached_check(scope)
+            if not satisfiable:
+                raise Unsatisfiable()
+            return model
+        if hints is not None:
+            return self._hinted_model(scope, self._hint_pairs(hints))
+        return self._checked_model(scope)
+
+    def _solve(self, scope):
+        # Check with the finite domain engine if possible, or with Z3 otherwise.
+        # Returns the result of the check along with a model, if satisfiable.
+        output = self._finite_domain_check(scope)
+        if output is not None:
+            return output
         output = scope.check()
-        return (output.r == 1), (self._active_scope.model() if output.r == 1 else None)
+        return output, (scope.model() if output == sat else None)
 
-    def model(self):
+    # Problems over at most this many bounded integer and boolean variables (and
+    # no more than finite_domain_max_nodes terms) are solved by the built-in
+    # finite domain engine rather than by Z3. Set to 0 to always use Z3.
+    finite_domain_limit = 12
+    finite_domain_max_domain = 64
+    finite_domain_max_nodes = 200
+    # Largest number of evaluations of constraints by the engine before it
+    # gives up and falls back to Z3.
+    finite_domain_max_checks = 20000
+
+    def _finite_domain_check(self, scope):
+        # Returns None if the engine does not apply, (result, model) otherwise.
+        if not self.finite_domain_limit or not scope.cacheable:
+            return None
+        # Each constraint takes at least one term, so larger problems are
+        # ruled out before translating anything.
+        if scope.size > self.finite_domain_max_nodes:
+            return None
+        problem = finite_domain_terms(scope.constraints, self.finite_domain_limit, self.finite_domain_max_nodes)
+        if problem is None:
+            return None
+        terms, variables = problem
+        kinds = ['bool' if v.sort().kind() == Z3_BOOL_SORT else 'int' for v in variables]
+        values = fd.solve(terms, kinds, self.finite_domain_max_domain, self.finite_domain_max_checks)
+        if values is None:
+            return None
+        if instrumentation.enabled: instrumentation.count('finite_domain_checks')
+        if values is False:
+            return unsat, None
+        return sat, ValuationModel(
+            (v, BoolVal(value) if kind == 'bool' else IntVal(value)) for v, kind, value in zip(variables, kinds, values))
+
+    def _checked_model(self, scope):
+        output, model = self._solve(scope)
+        if output == unsat:
+            raise Unsatisfiable(scope.unsat_core())
+        if output != sat:
+            raise Exception('Cannot obtain a model: {}'.format(scope.reason_unknown()))
+        return model
+
+    def _hinted_model(self, scope, pairs):
+        # Hints only steer the search, and are never imposed. Optimizers prefer
+        # solutions that stay close to them through soft constraints of the
+        # lowest priority, which are discarded afterwards.
+        if scope.is_optimizer:
+            scope.push()
+            try:
+                for symbol, value in pairs:
+                    scope.soft(symbol == value, group='__hints__')
+                return self._checked_model(scope)
+            finally:
+                scope.pop()
+        # Plain solvers assume the hinted values for a single check, which
+        # leaves nothing behind in the solver. If they are not consistent with
+        # the assertions, the scope is solved again without them.
+        if scope.check(*[symbol == value for symbol, value in pairs]) == sat:
+            return scope.model()
+        return self._checked_model(scope)
+
+    def _hint_pairs(self, hints):
+        # Hints are either (symbol, value) pairs or a previous model, in which
+        # case all primitive constants in it are taken.
+        if isinstance(hints, (list, tuple)):
+            return [(symbol, symbol.sort().cast(value)) for symbol, value in hints]
+        pairs = []
+        for decl in hints.decls():
+            if decl.arity() > 0 or not decl.range().kind() in _PRIMITIVE_SORTS:
+                continue
+            value = hints.evaluate(decl())
+            if encode_value(value) is not None:
+                pairs.append((decl(), value))
+        return pairs
+
+    def unsat_core(self, minimize=False):
+        return self._active_scope.unsat_core(minimize)
+
+    def export(self):
+        # SMT-LIB2 text of the active scope, along with the information that
+        # is needed to solve it elsewhere (see solve_smtlib).
+        scope = self._active_scope
+        # Only values of primitive constants are returned by solve_smtlib and
+        # read back by import_model, so anything else (including functions) is
+        # rejected here rather than silently dropped from the imported model.
+        expressions = list(scope.constraints) + [e for e, _ in scope.objectives]
+        for constant in constants(expressions):
+            if not constant.sort().kind() in _PRIMITIVE_SORTS:
+                raise Exception('Cannot export {}: values of sort {} cannot be imported back.'.format(
+                    constant, constant.sort()))
+        unsupported = functions(expressions)
+        if unsupported:
+            raise Exception('Cannot export {}: interpretations of functions cannot be imported back.'.format(
+                unsupported[0].name()))
+        manifest = {
+            'optimizer': scope.is_optimizer,
+            'sorts': sorted(sort.name() for sort in scope.sorts)
+        }
+        return scope.sexpr(), manifest
+
+    def import_model(self, values):
+        # Rebuild a model of the active scope from values keyed by symbol name,
+        # as returned by solve_smtlib.
         scope = self._active_scope
-        scope.check()
-        return scope.model()
+        expressions = list(scope.constraints) + [e for e, _ in scope.objectives]
+        assignment = []
+        for constant in constants(expressions):
+            value = values.get(constant.decl().name())
+            if value is not None and constant.sort().kind() in _PRIMITIVE_SORTS:
+                assignment.append((constant, decode_value(value, constant.sort())))
+        return ValuationModel(assignment)
+
+    def name(self, symbol):
+        # Functions are given by their declarations, constants by expressions.
+        if is_func_decl(symbol):
+            return symbol.name()
+        return symbol.decl().name()
+
+    def relax(self, label):
+        self._active_scope.relax(label)
+
+    def enforce(self, label):
+        self._active_scope.enforce(label)
+
+    # Minimum number of assertions per solver when decomposing. Independent
+    # components are packed together up to this size, since each solver comes
+    # with a fixed setup cost.
+    decomposition_batch_size = 500
+
+    def _decomposed_model(self, scope, pool):
+        groups = pack(components(scope.constraints), self.decomposition_batch_size)
+        if len(groups) < 2:
+            return self._checked_model(scope)
+        # Each group gets a solver of its own. When solving in parallel, each
+        # solver also needs a context of its own, since contexts are not thread safe.
+        solvers = []
+        for group in groups:
+            ctx = Context() if pool is not None else main_ctx()
+            solver = Solver(ctx=ctx)
+            solver.add([a.translate(ctx) for a in group] if pool is not None else group)
+            solvers.append(solver)
+        if pool is not None:
+            outputs = list(pool.map(lambda solver: solver.check(), solvers))
+        else:
+            outputs = [solver.check() for solver in solvers]
+        if any(output != sat for output in outputs):
+            raise Unsatisfiable()
+        models = [solver.model() for solver in solvers]
+        if pool is not None:
+            models = [model.translate(main_ctx()) for model in models]
+        return CompositeModel(models)
+
+    def _cached_check(self, scope):
+        canonical = canonicalize(scope.constraints)
+        if canonical is None:
+            output, model = self._solve(scope)
+            return output == sat, model
+        key, constants = canonical
+        entry = self._cache.get(key)
+        if entry is not None:
+            # Map the stored values back onto the constants of this problem.
+            is_sat, values = entry
+            if not is_sat:
+                return False, None
+            return True, ValuationModel(zip(constants, [decode_value(v, c.sort()) for c, v in zip(constants, values)]))
+        output, model = self._solve(scope)
+        if output == unsat:
+            self._cache.put(key, (False, None))
+        if output != sat:
+            return False, None
+        values = [encode_value(model.evaluate(c, model_completion=True)) for c in constants]
+        if not None in values:
+            self._cache.put(key, (True, values))
+        return True, model
 
     def push(self):
         self._active_scope.push()
@@ -41,28 +294,87 @@ class Z3Backend:
     def pop(self):
         self._active_scope.pop()
 
-    def add(self, constraint):
+    def add(self, constraint, label=None, origin=None):
+        if instrumentation.enabled:
+            instrumentation.count('assertions')
+            start = time.perf_counter()
         # Simplify non boolean constraints.
         if not type(constraint) == bool:
             constraint = simplify(constraint)
+        if instrumentation.enabled:
+            instrumentation.add_time('simplify', time.perf_counter() - start)
         # Add the constraint.
-        self._active_scope.add(constraint)
+        self._active_scope.add(constraint, label, origin)
+
+    def soft(self, constraint, weight=1, group=None):
+        self._active_scope.soft(constraint, weight, group)
 
-    def soft(self, constraint, weight=1):
-        self._active_scope.soft(constraint, weight)
+    def enter_assumptions(self):
+        self._active_scope.enter_assumptions()
+
+    def exit_assumptions(self):
+        self._active_scope.exit_assumptions()
 
     def declare_sort(self, name):
         sort = DeclareSort(name)
         self._active_scope.add_sort(sort)
         return sort
 
+    def enum_sort(self, name, members):
+        # Z3 only allows declaring an enumeration sort once per name, so that
+        # declarations are kept and handed back for the same members.
+        declared = self._enum_sorts.get(name)
+        if declared is None:
+            declared = self._enum_sorts[name] = (tuple(members), EnumSort(name, members))
+        elif declared[0] != tuple(members):
+            raise Exception('Enumerated sort {} was already declared with members {}'.format(
+                name, list(declared[0])))
+        sort, values = declared[1]
+        self._active_scope.add_sort(sort)
+        return sort, values
+
+    def register_value(self, symbol, value):
+        # Values of the model equal to the given constant are decoded as the
+        # given Python object (e.g. a member of an enumeration).
+        self._registered_values[symbol.get_id()] = value
+        self._registered_symbols[id(value)] = (value, symbol)
+
+    def to_obj(self, value):
+        registered = self._registered_values.get(value.get_id())
+        return registered if registered is not None else Z3CustomTypeWrapper(value)
+
+    def to_python(self, value):
+        return to_python(value, self.to_obj)
+
+    def unwrap(self, value):
+        # Z3 expression for a concrete value as returned by to_obj.
+        if isinstance(value, Z3CustomTypeWrapper):
+            return value.wrapped
+        registered = self._registered_symbols.get(id(value))
+        if registered is not None and registered[0] is value:
+            return registered[1]
+        return value
+
     def scope(self):
         scope = Z3Scope(self, Solver())
         self._transient_scopes.append(scope)
         return scope
 
-    def optimizer(self):
-        scope = Z3Scope(self, Optimize())
+    # MaxSAT engines that may be selected for soft constraints. All but wmax
+    # are core-guided; maxres-bin, rc2 and rc2bin are MaxRes variants.
+    maxsat_engines = ('maxres', 'maxres-bin', 'rc2', 'rc2bin', 'wmax')
+
+    def optimizer(self, priority=None, maxsat=None):
+        if not priority in (None, 'lex', 'pareto', 'box'):
+            raise Exception('Unknown optimization priority {}'.format(priority))
+        if not (maxsat is None or maxsat in self.maxsat_engines):
+            raise Exception('Unknown MaxSAT engine {}'.format(maxsat))
+        solver = Optimize()
+        if priority is not None:
+            solver.set(priority=priority)
+        if maxsat is not None:
+            solver.set(maxsat_engine=maxsat)
+        scope = Z3Scope(self, solver, priority=priority or 'lex')
         self._transient_scopes.append(scope)
         return scope
 
@@ -82,7 +394,34 @@ class Z3Backend:
         return Real(self._autogenerate_name(basename))
 
     def symbolic_int_array(self, basename):
-        return Array(self._autogenerate_name(basename), IntSort(), IntSort())
+        return self.symbolic_array(basename, IntSort(), IntSort())
+
+    def symbolic_array(self, basename, index_sort, element_sort):
+        return Array(self._autogenerate_name(basename), index_sort, element_sort)
+
+    def constant_array(self, index_sort, element_sort, value):
+        return K(index_sort, element_sort.cast(value))
+
+    def store(self, array, entries):
+        # Lower a whole sequence of (index, value) pairs into a chain of stores.
+        for idx, value in entries:
+            array = Store(array, idx, value)
+        return array
+
+    def range_equal(self, array, entries):
+        return And([Select(array, idx) == value for idx, value in entries])
+
+    def int_sort(self):
+        return IntSort()
+
+    def bool_sort(self):
+        return BoolSort()
+
+    def real_sort(self):
+        return RealSort()
+
+    def bitvec_sort(self, bits):
+        return BitVecSort(bits)
 
     def conjunction(self, *args):
         return And(*args)
@@ -93,11 +432,19 @@ class Z3Backend:
     def negation(self, *args):
         return Not(*args)
 
-    def forall(self, *args):
-        return ForAll(*args)
+    def forall(self, bound, body, patterns=(), weight=1, qid=None):
+        return ForAll(bound, body, weight=weight, qid=qid or '', patterns=_patterns(patterns))
+
+    def exists(self, bound, body, patterns=(), weight=1, qid=None):
+        return Exists(bound, body, weight=weight, qid=qid or '', patterns=_patterns(patterns))
 
-    def exists(self, *args):
-        return Exists(*args)
+    def expand(self, bound, body, domains, universal=True):
+        # Instances of the body for all combinations of values of the bound
+        # variables, as a conjunction (universal) or a disjunction.
+        domains = [[v.sort().cast(self.unwrap(value)) for value in domain]
+            for v, domain in zip(bound, domains)]
+        instances = [substitute(body, *zip(bound, values)) for values in itertools.product(*domains)]
+        return And(instances) if universal else Or(instances)
 
     def implies(self, antecedent, consequent):
         return Implies(antecedent, consequent)
@@ -124,23 +471,105 @@ class Z3Backend:
             return handler._handle_integer(output.as_long())
         # Real sort has kind '3'.
         if output.sort().kind() == 3:
-            return handler._handle_real(float(output.as_decimal(precision)))
+            return handler._handle_real(float(to_fraction(output, precision)))
+
+    def real_values(self, own_model, symbols, precision=6):
+        # Float values of the given reals in the model, converted by Z3 itself
+        # rather than going through Python integers or strings.
+        ref = own_model.ctx.ref() if hasattr(own_model, 'ctx') else main_ctx().ref()
+        output = []
+        for symbol in symbols:
+            value = own_model.evaluate(symbol, model_completion=True)
+            if not Z3_is_numeral_ast(ref, value.as_ast()):
+                value = value.approx(precision)
+            output.append(Z3_get_numeral_double(ref, value.as_ast()))
+        return output
+
+    def evaluate_array(self, own_model, array):
+        # Decode the interpretation of the array in the model into a default value
+        # and a dictionary of explicitly stored entries, walking the chain of
+        # stores down to the constant array at its base. Outer stores shadow inner
+        # ones. None is returned for interpretations that do not have this shape.
+        value = own_model[array]
+        entries = {}
+        try:
+            while value is not None and is_store(value) and value.num_args() == 3:
+                index = self.to_python(value.arg(1))
+                if index not in entries:
+                    entries[index] = self.to_python(value.arg(2))
+                value = value.arg(0)
+            if value is None or not is_K(value):
+                return None
+            return self.to_python(value.arg(0)), entries
+        except ValueError:
+            return None
 
     def evaluate_uninterpreted(self, f, *args):
         return f(*args)
 
     def evaluate_function_call(self, model, f, *args):
         # Unwrap wrapped objects.
-        copy = args
-        args = list(copy)
-        for i,arg in enumerate(copy):
-            if isinstance(arg, Z3CustomTypeWrapper):
-                args[i] = arg.wrapped
+        args = [self.unwrap(arg) for arg in args]
         # Evaluate the function and obtain a result.
         value = model.evaluate(f(*args))
         # If of a custom sort, wrap the resulting value in a wrapper.
         sorts = self._active_scope.sorts
-        return Z3CustomTypeWrapper(value) if value.sort() in sorts else value
+        return self.to_obj(value) if value.sort() in sorts else value
+
+    # Largest number of argument combinations for which the table of a function
+    # is filled in advance from the universes of its domain sorts.
+    function_table_limit = 4096
+
+    def function_table(self, model, f):
+        # Table of results of calls to a concretized function, keyed by value_key
+        # of the arguments. Filled in advance for functions over custom sorts and
+        # booleans, if the model provides their universes and there are not too
+        # many combinations. Other entries are added as calls are made.
+        table = {}
+        universes = []
+        for i in range(f.arity()):
+            sort = f.domain(i)
+            if sort.kind() == Z3_BOOL_SORT:
+                universes.append([BoolVal(False), BoolVal(True)])
+            elif _is_enumeration(sort):
+                universes.append([self.to_obj(sort.constructor(j)()) for j in range(sort.num_constructors())])
+            elif sort.kind() == Z3_UNINTERPRETED_SORT and hasattr(model, 'get_universe'):
+                universe = model.get_universe(sort)
+                if universe is None:
+                    return table
+                universes.append([Z3CustomTypeWrapper(element) for element in universe])
+            else:
+                return table
+        if functools.reduce(lambda count, universe: count * len(universe), universes, 1) > self.function_table_limit:
+            return table
+        for args in itertools.product(*universes):
+            table[self.value_key(args)] = self.evaluate_function_call(model, f, *args)
+        return table
+
+    def value_key(self, args):
+        # Hashable key for concrete argument values, or None if any of them is
+        # not concrete or not supported.
+        key = []
+        for arg in args:
+            if isinstance(arg, Z3CustomTypeWrapper):
+                key.append(arg.key)
+            elif self.unwrap(arg) is not arg:
+                key.append(self.unwrap(arg).get_id())
+            elif is_const(arg) and arg.get_id() in self._registered_values:
+                key.append(arg.get_id())
+            elif type(arg) == bool or type(arg) == int:
+                key.append(arg)
+            elif is_true(arg) or is_false(arg) or is_int_value(arg):
+                key.append(self.to_python(arg))
+            else:
+                return None
+        return tuple(key)
+
+    def select(self, array, index):
+        return array[self.unwrap(index)]
+
+    def is_custom_value(self, value):
+        return isinstance(value, Z3CustomTypeWrapper)
 
     def _autogenerate_name(self, basename):
         type(self)._autogenerate_name.counter += 1
@@ -148,26 +577,224 @@ class Z3Backend:
     
     _autogenerate_name.counter = 0
 
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class ValuationModel:
+
+    # Stand-in for a Z3 model given by an explicit assignment of values to
+    # constants, e.g. a model reconstructed from the result cache.
+    def __init__(self, assignment):
+        self._values = {c.get_id(): (c, v) for c, v in assignment}
+
+    def __getitem__(self, item):
+        if is_func_decl(item):
+            if item.arity() > 0:
+                return None
+            item = item()
+        entry = self._values.get(item.get_id())
+        return entry[1] if entry else None
+
+    def decls(self):
+        return [c.decl() for c, v in self._values.values()]
+
+    def evaluate(self, expression, model_completion=False):
+        entry = self._values.get(expression.get_id())
+        if entry:
+            return entry[1]
+        pairs = []
+        for c in constants([expression]):
+            entry = self._values.get(c.get_id())
+            if entry:
+                pairs.append(entry)
+            elif model_completion:
+                pairs.append((c, default_value(c.sort())))
+        return simplify(substitute(expression, *pairs) if pairs else expression)
+
+    eval = evaluate
+
+    def __repr__(self):
+        return '[{}]'.format(', '.join('{} = {}'.format(c, v) for c, v in self._values.values()))
+
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class CompositeModel:
+
+    # Model made up of the models of independent groups of assertions, which
+    # share no uninterpreted symbols among them.
+    def __init__(self, models):
+        self._models = models
+        self._owners = {}
+        for model in models:
+            for decl in model.decls():
+                self._owners[decl.get_id()] = model
+
+    def __getitem__(self, item):
+        decl = item if is_func_decl(item) else item.decl()
+        model = self._owners.get(decl.get_id())
+        return model[item] if model is not None else None
+
+    def decls(self):
+        return [decl for model in self._models for decl in model.decls()]
+
+    def evaluate(self, expression, model_completion=False):
+        if is_const(expression):
+            model = self._owners.get(expression.decl().get_id(), self._models[0])
+            return model.evaluate(expression, model_completion=model_completion)
+        # Evaluate in each of the models in turn, each one replacing the
+        # symbols it knows about.
+        for model in self._models:
+            expression = model.evaluate(expression)
+        if model_completion:
+            expression = self._models[0].evaluate(expression, model_completion=True)
+        return expression
+
+    eval = evaluate
+
+    def __repr__(self):
+        return '[{}]'.format(', '.join(repr(model)[1:-1] for model in self._models))
+
 #==================================================================================================
 #--------------------------------------------------------------------------------------------------
 class Z3Scope:
 
-    def __init__(self, backend, solver):
+    def __init__(self, backend, solver, priority='lex'):
         self._backend = backend
         self._solver = solver
         self._sorts = set()
+        self._priority = priority
+        # Objectives as (expression, maximize) pairs.
+        self._objectives = []
+        # Labelled constraints are guarded by indicator literals, which are
+        # passed to the solver as assumptions unless the label is relaxed.
+        self._literals = {}
+        self._origins = {}
+        self._relaxed = set()
+        # Indicator literals of the assumption scopes entered so far, innermost
+        # last. Each one implies the one of the enclosing scope.
+        self._guards = []
+        self._checked = ()
+        # Indicator literals of the bindings of check_with, by symbol and value.
+        self._bindings = {}
 
     def reset(self):
         self._solver.reset()
+        self._literals.clear()
+        self._origins.clear()
+        self._relaxed.clear()
+        self._guards.clear()
+        self._bindings.clear()
+
+    def check(self, *assumptions):
+        # The assumptions are kept so that the check can be repeated (see unsat_core).
+        self._checked = assumptions
+        if instrumentation.enabled:
+            return self._instrumented_check(assumptions)
+        return self._solver.check(*(self.assumptions + list(assumptions)))
+
+    def _instrumented_check(self, assumptions):
+        record = instrumentation.begin('check')
+        try:
+            start = time.perf_counter()
+            output = self._solver.check(*(self.assumptions + list(assumptions)))
+            instrumentation.add_time('check', time.perf_counter() - start)
+            instrumentation.count('checks')
+            statistics = self._solver.statistics()
+            instrumentation.add_statistics({key: statistics.get_key_value(key) for key in statistics.keys()})
+            return output
+        finally:
+            instrumentation.end(record)
+
+    def reason_unknown(self):
+        return self._solver.reason_unknown()
+
+    @property
+    def assumptions(self):
+        literals = [literal for label, literal in self._literals.items() if not label in self._relaxed]
+        return literals + self._guards[-1:]
+
+    def enter_assumptions(self):
+        # Unlike push and pop, constraints are kept in the solver after leaving
+        # the scope and only disabled, so lemmas learned meanwhile are not lost.
+        guard = Bool(self._backend._autogenerate_name('guard'))
+        if self._guards:
+            self._solver.add(Implies(guard, self._guards[-1]))
+        self._guards.append(guard)
+
+    def exit_assumptions(self):
+        self._solver.add(Not(self._guards.pop()))
+
+    @property
+    def constraints(self):
+        # Assertions along with the assumptions that are currently enabled, for
+        # those cases in which the assertions are handed to other solvers.
+        return list(self._solver.assertions()) + self.assumptions
+
+    @property
+    def size(self):
+        # Number of constraints, without wrapping each one of them.
+        return len(self._solver.assertions()) + len(self.assumptions)
+
+    def relax(self, label):
+        if not label in self._literals:
+            raise Exception('Unknown label: {}'.format(label))
+        self._relaxed.add(label)
+
+    def enforce(self, label):
+        self._relaxed.discard(label)
 
-    def check(self):
-        return self._solver.check()
+    def unsat_core(self, minimize=False):
+        # Map the literals in the core of the last check back to their labels.
+        labels = {literal.get_id(): label for label, literal in self._literals.items()}
+        core = [labels[literal.get_id()] for literal in self._solver.unsat_core() if literal.get_id() in labels]
+        if minimize and core:
+            # Deletion based minimization: drop each label in turn, and keep it
+            # dropped if the rest of the core remains unsatisfiable by itself,
+            # under the same guard and further assumptions as the last check.
+            for label in list(core):
+                remaining = [self._literals[l] for l in core if l != label] + self._guards[-1:] + list(self._checked)
+                if self._solver.check(*remaining) == unsat:
+                    core.remove(label)
+            # Repeat the last check, so that its results remain available.
+            self._solver.check(*(self.assumptions + list(self._checked)))
+        return UnsatCore({label: self._origins[label] for label in core})
+
+    @property
+    def is_optimizer(self):
+        return isinstance(self._solver, Optimize)
+
+    @property
+    def cacheable(self):
+        # Results of optimizers also depend on the objectives, which are not
+        # part of the assertions, so these are never cached. Neither are results
+        # for labelled constraints, for which unsat cores may be requested.
+        return not self.is_optimizer and not self._literals
+
+    def check_sat(self, *assumptions):
+        return self.check(*assumptions) == sat
+
+    def check_with(self, bindings):
+        # Bindings are assumed through indicator literals, each one implying an
+        # equality that is asserted only the first time that the value is bound.
+        # Unlike push and pop, lemmas learned by previous checks are kept.
+        output = self.check(*[self._binding(symbol, value) for symbol, value in bindings])
+        return (output == sat), (self._solver.model() if output == sat else None)
+
+    def _binding(self, symbol, value):
+        value = symbol.sort().cast(value)
+        key = (symbol.get_id(), value.get_id())
+        literal = self._bindings.get(key)
+        if literal is None:
+            literal = self._bindings[key] = Bool(self._backend._autogenerate_name('binding'))
+            self._solver.add(Implies(literal, symbol == value))
+        return literal
 
     def push(self):
         self._solver.push()
 
     def pop(self):
         self._solver.pop()
+        # Equalities of bindings may have been asserted since the push.
+        self._bindings.clear()
 
     def model(self):
         return self._solver.model()
@@ -176,17 +803,114 @@ class Z3Scope:
     def assertions(self):
         return self._solver.assertions()
 
-    def add(self, constraint):
-        self._solver.add(constraint)
+    def add(self, constraint, label=None, origin=None):
+        if label is not None:
+            # Constraints under the same label share the same indicator literal.
+            if not label in self._literals:
+                name = self._backend._autogenerate_name('label[{}]'.format(label))
+                self._literals[label] = Bool(name)
+                self._origins[label] = []
+            self._origins[label].append(origin if origin is not None else constraint)
+            constraint = Implies(self._literals[label], constraint)
+        self._solver.add(self._guarded(constraint))
 
-    def soft(self, constraint, weight=1):
-        self._solver.add_soft(constraint, weight=1)
+    def _guarded(self, constraint):
+        if not self._guards:
+            return constraint
+        return Implies(self._guards[-1], constraint)
+
+    def soft(self, constraint, weight=1, group=None):
+        # Soft constraints in the same group are combined into a single
+        # objective. Groups are then prioritized like any other objectives.
+        constraint = self._guarded(constraint)
+        if group is None:
+            self._solver.add_soft(constraint, weight=weight)
+        else:
+            self._solver.add_soft(constraint, weight=weight, id=group)
+
+    @property
+    def objectives(self):
+        return self._objectives
+
+    def sexpr(self):
+        # Enabled assumptions are exported as plain assertions.
+        self._solver.push()
+        try:
+            for literal in self.assumptions:
+                self._solver.add(literal)
+            return self._solver.sexpr()
+        finally:
+            self._solver.pop()
 
     def minimize(self, expression):
-        self._solver.minimize(expression)
+        self._objectives.append((expression, False))
+        return self._solver.minimize(expression)
 
     def maximize(self, expression):
-        self._solver.maximize(expression)
+        self._objectives.append((expression, True))
+        return self._solver.maximize(expression)
+
+    def indicator(self, name):
+        # Fresh literal to be passed as an assumption, and eventually retired.
+        return Bool(self._backend._autogenerate_name(name))
+
+    def retire(self, literal):
+        # Permanently disable the constraints conditioned on the literal.
+        self._solver.add(Not(literal))
+
+    def block(self, literal, model, expressions):
+        # Exclude the values that the given expressions take in the model from
+        # any further solution checked under the literal, by means of a single
+        # blocking clause.
+        self._solver.add(Implies(literal, Or([e != model.evaluate(e, model_completion=True) for e in expressions])))
+
+    def on_model(self, callback):
+        # Have the optimizer report each improving model as it is found.
+        self._solver.set_on_model(callback)
+
+    def pareto_front(self):
+        # Each check in pareto mode produces a new point of the front.
+        while self.check() == sat:
+            yield self._solver.model()
+
+    def improving_models(self, timeout=None):
+        # Yield a sequence of models, each one better than the previous one
+        # with respect to the objectives, until the optimum is reached or the
+        # time budget (in seconds) runs out. A separate plain solver is used so
+        # that a first model is available without waiting for optimality.
+        solver = Solver()
+        solver.add(self.constraints)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                solver.set(timeout=max(1, int(remaining * 1000)))
+            if solver.check() != sat:
+                return
+            model = solver.model()
+            yield model
+            if not self._objectives:
+                return
+            solver.add(self._improvement(model))
+
+    def _improvement(self, model):
+        values = [model.evaluate(e, model_completion=True) for e, _ in self._objectives]
+        better = [e > v if maximize else e < v
+            for (e, maximize), v in zip(self._objectives, values)]
+        if self._priority == 'lex':
+            # Lexicographic improvement: all previous objectives stay the same,
+            # and one gets strictly better.
+            cases, same = [], []
+            for (e, _), v, b in zip(self._objectives, values, better):
+                cases.append(And(same + [b]))
+                same.append(e == v)
+            return Or(cases)
+        # Pareto improvement: no objective gets worse, and at least one gets better.
+        no_worse = [e >= v if maximize else e <= v
+            for (e, maximize), v in zip(self._objectives, values)]
+        return And(And(no_worse), Or(better))
 
     def add_sort(self, sort):
         self._sorts.add(sort)
@@ -205,8 +929,25 @@ class Z3Scope:
 #--------------------------------------------------------------------------------------------------
 class Z3CustomTypeWrapper:
 
-    def __init__(self, obj):
-        self._obj = obj
+    # Values of custom sorts are interned: wrapping the same element of a model
+    # always gives the same object, for as long as it is alive, so that
+    # comparisons and hashing do not need to go through Z3.
+    # AST ids are only unique within a context, so the key includes it. The
+    # context cannot be collected while a wrapper holds one of its terms.
+    __slots__ = ('_obj', '_key', '_hash', '__weakref__')
+
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, obj):
+        key = (id(obj.ctx), obj.get_id())
+        wrapper = cls._interned.get(key)
+        if wrapper is None:
+            wrapper = super().__new__(cls)
+            wrapper._obj = obj
+            wrapper._key = key
+            wrapper._hash = hash(key)
+            cls._interned[key] = wrapper
+        return wrapper
 
     @property
     def wrapped(self):
@@ -216,15 +957,22 @@ class Z3CustomTypeWrapper:
     def value(self):
         return self.wrapped
 
+    @property
+    def key(self):
+        return self._key
+
     def __eq__(self, other):
         if isinstance(other, Z3CustomTypeWrapper):
-            return self._obj.eq(other._obj)
+            return self is other
         else:
             return other.__eq__(self)
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        return self._hash
+
     def __repr__(self):
         return self.value.__repr__()
 
@@ -234,5 +982,280 @@ def to_int(z3_object):
 def to_bool(z3_object):
     return bool(z3_object)
 
+def to_fraction(z3_object, precision=6):
+    # Exact value of a real number from a model. Irrational (algebraic) numbers
+    # are approximated to the given number of decimal places.
+    ref = z3_object.ctx_ref()
+    if not Z3_is_numeral_ast(ref, z3_object.as_ast()):
+        z3_object = z3_object.approx(precision)
+    # Numerals are printed by Z3 either as integers or as ratios n/d, both of
+    # which Fraction parses directly.
+    return fractions.Fraction(Z3_get_numeral_string(ref, z3_object.as_ast()))
+
 def to_obj(z3_object):
-    return Z3CustomTypeWrapper(z3_object)
\ No newline at end of file
+    return Z3CustomTypeWrapper(z3_object)
+
+def _patterns(patterns):
+    return [terms[0] if len(terms) == 1 else MultiPattern(*terms) for terms in patterns]
+
+def _is_enumeration(sort):
+    return sort.kind() == Z3_DATATYPE_SORT and all(
+        sort.constructor(i).arity() == 0 for i in range(sort.num_constructors()))
+
+def solve_smtlib(smt2, manifest=None):
+    # Solve a scope exported as SMT-LIB2, e.g. in a worker process. Values of
+    # primitive constants are returned as plain Python objects keyed by name,
+    # or None if there is no model.
+    context = Context()
+    if manifest is not None and manifest.get('optimizer'):
+        solver = Optimize(ctx=context)
+    else:
+        solver = Solver(ctx=context)
+    solver.from_string(smt2)
+    if solver.check() != sat:
+        return None
+    model = solver.model()
+    values = {}
+    for decl in model.decls():
+        if decl.arity() == 0:
+            value = encode_value(model[decl])
+            if value is not None:
+                values[decl.name()] = value
+    return values
+
+def to_python(z3_object, to_obj=to_obj):
+    # Convert a value from a model into the Python value that the corresponding
+    # symbolic type would produce once concretized. All of them are hashable.
+    # Constants of other sorts are converted by to_obj.
+    if is_true(z3_object):
+        return True
+    if is_false(z3_object):
+        return False
+    if is_int_value(z3_object) or is_bv_value(z3_object):
+        return z3_object.as_long()
+    if is_rational_value(z3_object) or is_algebraic_value(z3_object):
+        # As for concretized reals (see evaluate_in_model).
+        return float(to_fraction(z3_object))
+    if not is_const(z3_object):
+        raise ValueError('Cannot convert {} into a Python value'.format(z3_object))
+    return to_obj(z3_object)
+
+_PRIMITIVE_SORTS = (Z3_BOOL_SORT, Z3_INT_SORT, Z3_REAL_SORT, Z3_BV_SORT)
+
+def constants(expressions):
+    # Uninterpreted constants in the given expressions, in order of first appearance.
+    return [e for e in _uninterpreted(expressions) if e.num_args() == 0]
+
+def functions(expressions):
+    # Declarations of the uninterpreted functions applied in the given expressions.
+    output, seen = [], set()
+    for e in _uninterpreted(expressions):
+        if e.num_args() > 0 and not e.decl().get_id() in seen:
+            seen.add(e.decl().get_id())
+            output.append(e.decl())
+    return output
+
+def _uninterpreted(expressions):
+    # Applications of uninterpreted constants and functions, in order of first appearance.
+    output, seen, stack = [], set(), list(reversed(expressions))
+    while stack:
+        e = stack.pop()
+        key = e.get_id()
+        if key in seen:
+            continue
+        seen.add(key)
+        if is_quantifier(e):
+            stack.append(e.body())
+        elif is_app(e):
+            if e.decl().kind() == Z3_OP_UNINTERPRETED:
+                output.append(e)
+            stack.extend(reversed(e.children()))
+    return output
+
+def components(assertions):
+    # Split the assertions into groups that share no uninterpreted constants,
+    # functions or sorts, i.e. the connected components of the graph in which
+    # assertions are linked through the symbols they mention.
+    parent = {}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    groups = []
+    for i, assertion in enumerate(assertions):
+        root = parent[('assertion', i)] = ('assertion', i)
+        for key in _symbol_keys(assertion):
+            other = find(parent.setdefault(key, key))
+            if other != root:
+                parent[other] = root
+    for i, assertion in enumerate(assertions):
+        groups.append(find(('assertion', i)))
+    output = {}
+    for assertion, group in zip(assertions, groups):
+        output.setdefault(group, []).append(assertion)
+    return list(output.values())
+
+def pack(groups, size):
+    # Pack groups into as many batches as possible with at least the given number
+    # of elements each, balancing them by assigning the largest groups first.
+    total = sum(len(group) for group in groups)
+    batches = [[] for i in range(max(1, min(len(groups), total // size)))]
+    for group in sorted(groups, key=len, reverse=True):
+        min(batches, key=len).extend(group)
+    return batches
+
+def _symbol_keys(expression):
+    # Walk the expression through the low level API, which is much faster than
+    # going through the Python wrappers for each node.
+    ctx = expression.ctx.ref()
+    keys, seen, stack = set(), set(), [expression.as_ast()]
+    while stack:
+        e = stack.pop()
+        key = Z3_get_ast_id(ctx, e)
+        if key in seen:
+            continue
+        seen.add(key)
+        kind = Z3_get_ast_kind(ctx, e)
+        if kind == Z3_APP_AST:
+            app = Z3_to_app(ctx, e)
+            decl = Z3_get_app_decl(ctx, app)
+            if Z3_get_decl_kind(ctx, decl) == Z3_OP_UNINTERPRETED:
+                keys.add(('decl', Z3_get_ast_id(ctx, Z3_func_decl_to_ast(ctx, decl))))
+                _add_sort_key(ctx, keys, Z3_get_sort(ctx, e))
+            for i in range(Z3_get_app_num_args(ctx, app)):
+                stack.append(Z3_get_app_arg(ctx, app, i))
+        elif kind == Z3_QUANTIFIER_AST:
+            for i in range(Z3_get_quantifier_num_bound(ctx, e)):
+                _add_sort_key(ctx, keys, Z3_get_quantifier_bound_sort(ctx, e, i))
+            stack.append(Z3_get_quantifier_body(ctx, e))
+    return keys
+
+_FINITE_DOMAIN_OPERATORS = {
+    Z3_OP_AND: 'and', Z3_OP_OR: 'or', Z3_OP_NOT: 'not', Z3_OP_EQ: 'eq', Z3_OP_DISTINCT: 'distinct',
+    Z3_OP_LE: 'le', Z3_OP_LT: 'lt', Z3_OP_GE: 'ge', Z3_OP_GT: 'gt', Z3_OP_ADD: 'add',
+    Z3_OP_SUB: 'sub', Z3_OP_MUL: 'mul', Z3_OP_UMINUS: 'uminus', Z3_OP_ITE: 'ite',
+    Z3_OP_IMPLIES: 'implies', Z3_OP_IFF: 'iff', Z3_OP_XOR: 'xor'
+}
+
+def finite_domain_terms(assertions, max_variables, max_nodes):
+    # Translate the assertions into terms for the finite domain engine, along
+    # with the constants standing for its variables. Returns None if there are
+    # too many of them, or anything other than integer and boolean constants,
+    # integer numerals and the operators above.
+    assertions = list(assertions)
+    if not assertions:
+        return None
+    ctx = assertions[0].ctx
+    ref = ctx.ref()
+    terms, variables, memo = [], {}, {}
+
+    def translate(e):
+        key = Z3_get_ast_id(ref, e)
+        if key in memo:
+            return memo[key]
+        if len(memo) >= max_nodes:
+            return None
+        ast_kind = Z3_get_ast_kind(ref, e)
+        sort = Z3_get_sort_kind(ref, Z3_get_sort(ref, e))
+        if ast_kind == Z3_NUMERAL_AST:
+            if sort != Z3_INT_SORT:
+                return None
+            memo[key] = term = ('const', int(Z3_get_numeral_string(ref, e)))
+            return term
+        if ast_kind != Z3_APP_AST:
+            return None
+        app = Z3_to_app(ref, e)
+        kind = Z3_get_decl_kind(ref, Z3_get_app_decl(ref, app))
+        count = Z3_get_app_num_args(ref, app)
+        if kind == Z3_OP_UNINTERPRETED:
+            if count > 0 or not sort in (Z3_INT_SORT, Z3_BOOL_SORT):
+                return None
+            if not key in variables:
+                if len(variables) >= max_variables:
+                    return None
+                variables[key] = (len(variables), _to_expr_ref(e, ctx))
+            term = ('var', variables[key][0])
+        elif kind == Z3_OP_TRUE or kind == Z3_OP_FALSE:
+            term = ('const', kind == Z3_OP_TRUE)
+        elif kind in _FINITE_DOMAIN_OPERATORS:
+            args = []
+            for i in range(count):
+                arg = translate(Z3_get_app_arg(ref, app, i))
+                if arg is None:
+                    return None
+                args.append(arg)
+            term = (_FINITE_DOMAIN_OPERATORS[kind],) + tuple(args)
+        else:
+            return None
+        memo[key] = term
+        return term
+
+    for assertion in assertions:
+        term = translate(assertion.as_ast())
+        if term is None:
+            return None
+        terms.append(term)
+    return terms, [v for i, v in sorted(variables.values(), key=lambda entry: entry[0])]
+
+def _add_sort_key(ctx, keys, sort):
+    if Z3_get_sort_kind(ctx, sort) == Z3_UNINTERPRETED_SORT:
+        keys.add(('sort', Z3_get_ast_id(ctx, Z3_sort_to_ast(ctx, sort))))
+
+def canonicalize(assertions):
+    # Compute a key for the given assertions that does not depend on the
+    # counters of autogenerated names, by renaming constants in order of
+    # first appearance. Returns the key along with the constants in that
+    # order, or None if the assertions are outside of what may be cached
+    # (i.e. anything other than quantifier free formulas over constants of
+    # primitive sorts).
+    assertions = list(assertions)
+    output, seen, stack = [], set(), list(reversed(assertions))
+    while stack:
+        e = stack.pop()
+        key = e.get_id()
+        if key in seen:
+            continue
+        seen.add(key)
+        if not is_app(e):
+            return None
+        if e.decl().kind() == Z3_OP_UNINTERPRETED:
+            if e.num_args() > 0 or not e.sort().kind() in _PRIMITIVE_SORTS:
+                return None
+            output.append(e)
+        else:
+            stack.extend(reversed(e.children()))
+    formula = And(assertions)
+    if output:
+        renamed = [Const('{}:{}'.format(_basename(c), i), c.sort()) for i, c in enumerate(output)]
+        formula = substitute(formula, *zip(output, renamed))
+    return hashlib.sha256(formula.sexpr().encode()).hexdigest(), output
+
+def _basename(constant):
+    return re.sub(r':\d+$', '', constant.decl().name())
+
+def encode_value(value):
+    # Encode a model value as a plain Python object, or None if not possible.
+    if is_true(value) or is_false(value):
+        return is_true(value)
+    if is_int_value(value) or is_bv_value(value):
+        return value.as_long()
+    if is_rational_value(value):
+        return (value.numerator_as_long(), value.denominator_as_long())
+    return None
+
+def decode_value(value, sort):
+    if sort.kind() == Z3_BOOL_SORT:
+        return BoolVal(value)
+    if sort.kind() == Z3_INT_SORT:
+        return IntVal(value)
+    if sort.kind() == Z3_REAL_SORT:
+        return RatVal(value[0], value[1])
+    return BitVecVal(value, sort.size())
+
+def default_value(sort):
+    if sort.kind() in _PRIMITIVE_SORTS:
+        return decode_value((0, 1) if sort.kind() == Z3_REAL_SORT else 0, sort)
+    raise Z3Exception('No default value for sort {}'.format(sort))
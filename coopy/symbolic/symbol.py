@@ -10,6 +10,8 @@ class Symbol(Evaluable):
         # Symbolic integers keep a reference to a modle object
         # which allows to evaluate the symbolic value once it is set.
         self._model = None
+        # Model and callback of a deferred concretization, if any.
+        self._pending = None
 
     @property
     def name(self):
@@ -21,6 +23,8 @@ class Symbol(Evaluable):
         
     @property
     def concretized(self):
+        if self._pending is not None:
+            self._resolve()
         return self._model != None
 
     @property
@@ -40,6 +44,20 @@ class Symbol(Evaluable):
 
     def concretize(self, model):
         self._model = model
+        self._pending = None
+
+    def concretize_lazily(self, model, resolve):
+        # Defer concretization until the symbol is first used. Then, resolve is
+        # called with the symbol and the model, and concretizes it (or not).
+        self._pending = (model, resolve)
+
+    def materialize(self):
+        return self.concretized
+
+    def _resolve(self):
+        model, resolve = self._pending
+        self._pending = None
+        resolve(self, model)
 
     def __repr__(self):
         if self.concretized:
@@ -32,9 +32,12 @@ class ConcretizableFunction(Evaluable):
         self._name = name
         self._symbol = backend_uninterpreted
         self._model = None
+        # Results of calls once concretized, keyed by the values of the arguments.
+        self._table = None
 
     def concretize(self, model):
         self._model = model
+        self._table = None
 
     @property
     def concretized(self):
@@ -54,8 +57,19 @@ class ConcretizableFunction(Evaluable):
         args = [arg.value for arg in args]
 
         if self.concretized:
-            output = backend.evaluate_function_call(self._model, self.symbol, *args)
+            output = self._concrete_call(args)
         else:
             output = RValue(backend.evaluate_uninterpreted(self.symbol, *args))
 
-        return output if wrapper is None else wrapper(value=output) 
\ No newline at end of file
+        return output if wrapper is None else wrapper(value=output) 
+
+    def _concrete_call(self, args):
+        key = backend.value_key(args)
+        if key is None:
+            return backend.evaluate_function_call(self._model, self.symbol, *args)
+        if self._table is None:
+            self._table = backend.function_table(self._model, self.symbol)
+        output = self._table.get(key)
+        if output is None:
+            output = self._table[key] = backend.evaluate_function_call(self._model, self.symbol, *args)
+        return output
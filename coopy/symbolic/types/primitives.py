@@ -1,6 +1,9 @@
-from .. import Symbol, Evaluable, do_evaluate
+from .. import Symbol, Evaluable, do_evaluate, is_evaluable
 from ...op.arithmetic import ConcretizableArithmeticOperand
 from ...op.logic import Predicate, ConcretizableEntity
+from ...smt import backend, backend_real_to_fraction
+
+from array import array
 
 # TODO: make this less coupled to Z3 model outputs.
 
@@ -31,17 +34,28 @@ class SymbolicReal(Symbol, SymbolicPrimitive, ConcretizableArithmeticOperand):
 
     def __init__(self, *args, precision=6, **kwargs):
         super().__init__(*args, **kwargs)
+        # Number of decimal places of approximations of irrational values.
         self._concretization_precision = precision
+        self._exact_value = None
+        self._concretized_value = None
+
+    def concretize(self, model):
+        super().concretize(model)
+        self._exact_value = None
         self._concretized_value = None
 
     @property
-    def concrete_value(self):
-        # Get the value as a string, and then parse it into a float. Cache the result
-        # for eventual reuse.
-        if not self._concretized_value:
-            model_str = super().concrete_value.as_float(self._concretization_precision)
-            self._concretized_value = float(model_str)
+    def exact_value(self):
+        # Value as a Fraction, extracted from the model only once.
+        if self._exact_value is None:
+            self._exact_value = backend_real_to_fraction(
+                super().concrete_value, self._concretization_precision)
+        return self._exact_value
 
+    @property
+    def concrete_value(self):
+        if self._concretized_value is None:
+            self._concretized_value = float(self.exact_value)
         return self._concretized_value
 
 class SymbolicArray(Symbol, ConcretizableEntity):
@@ -49,25 +63,145 @@ class SymbolicArray(Symbol, ConcretizableEntity):
     def __init__(self, *args, datatype=SymbolicInteger, **kwargs):
         super().__init__(*args, **kwargs)
         self._DataType = datatype
-        self._created = []
+        # Element objects created by array accesses, by index.
+        self._created = {}
+        # Concrete element values read after concretization, by index, for
+        # those cases in which the array model could not be decoded.
+        self._values = {}
+        self._array_model = None
+
+    @property
+    def array_model(self):
+        # Decode the model of the array only once, the first time it is needed.
+        if self._array_model is None and self.concretized:
+            decoded = backend.evaluate_array(self._model, self.symbol)
+            self._array_model = ArrayModel(*decoded) if decoded else False
+        return self._array_model or None
 
     def concretize(self, model):
         super().concretize(model)
+        self._array_model = None
         # Also concretize elements created by array accesses.
-        for c in self._created:
+        for c in self._created.values():
             c.concretize(model)
 
     def __getitem__(self, idx):
         idx = do_evaluate(idx)
-        element = self.symbol[idx]
-        element_name = '{}[{}]'.format(self.name, idx)
-        element_object = self._DataType(name=element_name, backend_symbol=element)
         if self.has_concrete_value:
+            return self._concrete_element(idx)
+        element_object = self._created.get(idx)
+        if element_object is None:
+            element_object = self._element(idx)
+            self._created[idx] = element_object
+        return element_object
+
+    def store(self, values, start=0):
+        # Return a new array, equal to this one except for the given values,
+        # which are stored starting at the given index. Values may be given as
+        # any sequence (e.g. a list or a NumPy array) or as a mapping from
+        # indices to values.
+        symbol = backend.store(self.symbol, _entries(values, start))
+        return SymbolicArray(self.name, symbol, datatype=self._DataType)
+
+    def equals_range(self, values, start=0):
+        # Predicate stating that the array holds the given values starting
+        # at the given index.
+        return ArrayRangeEqual(self, _entries(values, start))
+
+    def _concrete_element(self, idx):
+        # Indices given as plain Python values or as concrete values of custom
+        # sorts are looked up directly in the decoded array model. Anything else
+        # is evaluated through the backend.
+        if isinstance(idx, (int, bool)) or backend.is_custom_value(idx):
+            array_model = self.array_model
+            if array_model is not None:
+                return array_model[idx]
+        try:
+            return self._values[idx]
+        except KeyError:
+            pass
+        element_object = self._created.get(idx)
+        if element_object is None:
+            element_object = self._element(idx)
             element_object.concretize(self._model)
-            return element_object.concrete_value
-        else:
-            self._created.append(element_object)
-            return element_object
+        value = self._values[idx] = element_object.concrete_value
+        return value
+
+    def _element(self, idx):
+        element_name = '{}[{}]'.format(self.name, idx)
+        return self._DataType(name=element_name, backend_symbol=backend.select(self.symbol, idx))
+
+class ArrayRangeEqual(Predicate):
+
+    def __init__(self, array, entries):
+        self._array = array
+        self._entries = entries
+
+    @property
+    def value(self):
+        return backend.range_equal(self._array.symbol, self._entries)
+
+    @property
+    def has_concrete_value(self):
+        return False
+
+def _entries(values, start):
+    items = values.items() if hasattr(values, 'items') else enumerate(values, start)
+    return [(_plain(idx), _plain(value)) for idx, value in items]
+
+def _plain(value):
+    # Lower evaluables and unwrap NumPy scalars into plain Python values.
+    if is_evaluable(value):
+        return value.value
+    return value.item() if hasattr(value, 'item') else value
+
+# Compact representation of a concretized array: a default value along
+# with the entries that were explicitly stored in the model.
+class ArrayModel:
+
+    def __init__(self, default, entries):
+        self._default = default
+        self._entries = entries
+
+    @property
+    def default(self):
+        return self._default
+
+    @property
+    def entries(self):
+        return self._entries
+
+    def __getitem__(self, idx):
+        return self._entries.get(idx, self._default)
+
+    def dense(self, length, start=0):
+        values = [self[i] for i in range(start, start + length)]
+        if all(type(v) == int for v in values):
+            return array('q', values)
+        if all(type(v) == float for v in values):
+            return array('d', values)
+        return values
+
+def real_vector(reals, model=None):
+    # Values of the given reals as floats, all at once, from the given backend
+    # model or from the ones they were concretized with. A NumPy array if NumPy
+    # is available, and an array('d') otherwise.
+    groups = {}
+    for i, real in enumerate(reals):
+        own_model = model if model is not None else (real._model if real.concretized else None)
+        if own_model is None:
+            raise Exception('real_vector called without previous concretization')
+        groups.setdefault(id(own_model), (own_model, []))[1].append(i)
+    output = [0.0] * len(reals)
+    for own_model, indices in groups.values():
+        symbols = [reals[i].symbol for i in indices]
+        for i, value in zip(indices, backend.real_values(own_model, symbols)):
+            output[i] = value
+    try:
+        import numpy
+    except ImportError:
+        return array('d', output)
+    return numpy.array(output, dtype=float)
 
 class ConcreteWrapper(Evaluable, SymbolicPrimitive, ConcretizableArithmeticOperand):
     
@@ -6,14 +6,82 @@ from ...op.logic import ConcretizableEntity
 #--------------------------------------------------------------------------------------------------
 class Sort:
 
-    def __init__(self, name, backend_sort):
+    def __init__(self, name, backend_sort, kind='custom'):
         self._name = name
         self._backend_sort = backend_sort
+        # One of 'int', 'bool', 'real', 'bitvec' for built-in sorts,
+        # and 'custom' for declared sorts.
+        self._kind = kind
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def kind(self):
+        return self._kind
 
     @property
     def symbol(self):
         return self._backend_sort
 
+#==================================================================================================
+#--------------------------------------------------------------------------------------------------
+class EnumSort(Sort):
+
+    # Finite sort with the given members. Members are those of a Python
+    # enumeration, which may be used directly in constraints, and values of the
+    # sort are decoded back to them once concretized.
+    def __init__(self, name, backend_sort, members):
+        super().__init__(name, backend_sort, kind='enum')
+        self._members = members
+
+    @property
+    def members(self):
+        return self._members
+
+    def __getitem__(self, name):
+        return self._members[name]
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def __len__(self):
+        return len(self._members)
+
+class EnumValue(Evaluable):
+
+    # Mixin for members of the Python enumerations of enumerated sorts. Their
+    # value is the backend constant, set right after creating the enumeration.
+    @property
+    def value(self):
+        return self._symbol
+
+    @property
+    def symbol(self):
+        return self._symbol
+
+    @property
+    def has_concrete_value(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, EnumValue):
+            return self is other
+        # Operators evaluated once their operands have been concretized compare
+        # decoded members against the constants of other members.
+        for member in type(self):
+            if other is member._symbol:
+                return self is member
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self._name_)
+
 #==================================================================================================
 #--------------------------------------------------------------------------------------------------
 class SymbolicObject(Symbol, ConcretizableEntity):
@@ -21,12 +89,20 @@ class SymbolicObject(Symbol, ConcretizableEntity):
     def __init__(self, name, backend_symbol, sort):
         super().__init__(name, backend_symbol)
         self._sort = sort
+        self._concrete = None
 
     @property
     def sort(self):
         return self._sort
 
+    def concretize(self, model):
+        super().concretize(model)
+        self._concrete = None
+
     @property
     def concrete_value(self):
-        value = super().concrete_value
-        return backend_obj_to_obj(value)
\ No newline at end of file
+        # Evaluated once per model; the backend returns the same (interned)
+        # object for the same element every time.
+        if self._concrete is None:
+            self._concrete = backend_obj_to_obj(super().concrete_value)
+        return self._concrete
\ No newline at end of file
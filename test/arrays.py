@@ -16,5 +16,80 @@ class TestArrays(unittest.TestCase):
         self.assertEqual(x[0], 5)
         self.assertEqual(x[1], 4)
 
+    def test_repeated_access(self):
+        x = symbolic_int_array('arr')
+        for i in range(10):
+            require(x[i % 2] == i % 2 + 3)
+        self.assertEqual(len(x._created), 2)
+        self.assertTrue(x[0] is x[0])
+        concretize()
+        self.assertEqual([x[0], x[1], x[0]], [3, 4, 3])
+        self.assertEqual(len(x._created), 2)
+
+    def test_array_model(self):
+        x = symbolic_int_array('arr')
+        require(x[3] == 7)
+        require(x[5] == 8)
+        concretize()
+        model = x.array_model
+        self.assertEqual(model[3], 7)
+        self.assertEqual(model[5], 8)
+        self.assertEqual(x[1000], model.default)
+        self.assertEqual(list(model.dense(3, start=3)), [7, x[4], 8])
+
+    def test_typed_arrays(self):
+        b = symbolic_array('b', element=bool)
+        r = symbolic_array('r', element=float)
+        v = symbolic_array('v', index=bitvec_sort(8), element=bitvec_sort(8))
+        require(b[0] & neg(b[1]))
+        require(r[0] * 2 == 1)
+        require(v[3] == 200)
+        concretize()
+        self.assertTrue(b[0])
+        self.assertFalse(b[1])
+        self.assertEqual(r[0], 0.5)
+        self.assertEqual(v[3], 200)
+
+    def test_custom_sort_elements(self):
+        S = sort('S')
+        s = symbolic('s', S)
+        x = symbolic_array('x', element=S)
+        require(x[0] == s)
+        concretize()
+        self.assertTrue(x[0] == s)
+
+    def test_real_elements(self):
+        r = symbolic_array('r', element=float)
+        x = symbolic_real('x')
+        require((r[0] * 3 == 1) & (r[1] * r[1] == 2) & (r[1] > 0))
+        require(x * x == 2)
+        require(x > 0)
+        concretize()
+        model = r.array_model
+        self.assertIsNotNone(model)
+        # Elements decode as concretized reals do.
+        self.assertEqual(model[0], 1 / 3)
+        self.assertEqual(model[1], x.value)
+
+    def test_custom_sort_indices(self):
+        S = sort('S')
+        s, t = symbolic('s', S), symbolic('t', S)
+        x = symbolic_array('x', index=S)
+        require(s != t)
+        require(x[s] == 1)
+        require(x[t] == 2)
+        concretize()
+        self.assertEqual(x[s.value], 1)
+        self.assertEqual(x[t.value], 2)
+
+    def test_bulk_operations(self):
+        x = symbolic_int_array('x')
+        y = symbolic_int_array('y')
+        require(x.equals_range([4, 5, 6], start=10))
+        require(y == constant_array(0).store({1: 7, 2: 8}))
+        concretize()
+        self.assertEqual([x[10], x[11], x[12]], [4, 5, 6])
+        self.assertEqual([y[0], y[1], y[2], y[3]], [0, 7, 8, 0])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+import unittest
+import coopy
+
+from coopy import symbolic_int, require
+
+class TestAssumptionScopes(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+
+    def test_constraints_disabled_on_exit(self):
+        x = symbolic_int('x')
+        require((x >= 0) & (x < 10))
+        with coopy.assumption_scope():
+            require(x > 20)
+            self.assertFalse(coopy.check_sat()[0])
+        self.assertTrue(coopy.check_sat()[0])
+        with coopy.assumption_scope():
+            require(x == 7)
+            sat, model = coopy.check_sat()
+            self.assertTrue(sat)
+            self.assertEqual(model[x], 7)
+
+    def test_nested_scopes(self):
+        x = symbolic_int('x')
+        with coopy.assumption_scope():
+            require(x > 5)
+            with coopy.assumption_scope():
+                require(x < 8)
+                sat, model = coopy.check_sat()
+                self.assertTrue(sat)
+                self.assertTrue(model[x] in (6, 7))
+                require(x < 5)
+                self.assertFalse(coopy.check_sat()[0])
+            sat, model = coopy.check_sat()
+            self.assertTrue(sat)
+            self.assertTrue(model[x] > 5)
+        require(x < 0)
+        self.assertTrue(coopy.check_sat()[0])
+
+    def test_optimizer_scope(self):
+        x = symbolic_int('x')
+        with coopy.optimizer():
+            require((x >= 0) & (x <= 10))
+            coopy.maximize(x)
+            with coopy.assumption_scope():
+                require(x < 4)
+                self.assertEqual(coopy.check_sat()[1][x], 3)
+            self.assertEqual(coopy.check_sat()[1][x], 10)
+
+if __name__ == '__main__':
+    unittest.main()
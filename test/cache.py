@@ -0,0 +1,79 @@
+import unittest
+import coopy
+import tempfile
+
+from coopy import symbolic_int, symbolic_real, require
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+        coopy.enable_cache(maxsize=2)
+
+    def tearDown(self):
+        coopy.disable_cache()
+
+    def build(self):
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        r = symbolic_real('r')
+        require((x > 2) & (y == x + 1) & (r * 2 == y))
+        return x, y, r
+
+    def test_hit_after_renaming(self):
+        self.build()
+        coopy.concretize()
+        coopy.reset()
+        x, y, r = self.build()
+        sat, model = coopy.check_sat()
+        self.assertEqual(coopy.solver.cache.statistics['hits'], 1)
+        self.assertEqual(coopy.solver.cache.statistics['misses'], 1)
+        self.assertTrue(model[x] > 2)
+        self.assertEqual(model[y], model[x] + 1)
+        self.assertEqual(model[r] * 2, model[y])
+        coopy.concretize()
+        self.assertEqual(y, x + 1)
+
+    def test_uncached_problems(self):
+        S = coopy.sort('S')
+        s = coopy.symbolic('s', S)
+        t = coopy.symbolic('t', S)
+        require(s != t)
+        coopy.concretize()
+        self.assertEqual(coopy.solver.cache.statistics['misses'], 0)
+        self.assertTrue(s != t)
+
+    def test_unsat(self):
+        for i in range(2):
+            coopy.reset()
+            x = symbolic_int('x')
+            require((x > 2) & (x < 1))
+            sat, model = coopy.check_sat()
+            self.assertFalse(sat)
+        self.assertEqual(coopy.solver.cache.statistics['hits'], 1)
+
+    def test_eviction(self):
+        for bound in (1, 2, 3, 1):
+            coopy.reset()
+            x = symbolic_int('x')
+            require(x == bound)
+            coopy.check_sat()
+        statistics = coopy.solver.cache.statistics
+        self.assertEqual(statistics['evictions'], 2)
+        self.assertEqual(statistics['hits'], 0)
+
+    def test_disk_tier(self):
+        with tempfile.TemporaryDirectory() as directory:
+            coopy.enable_cache(maxsize=2, directory=directory)
+            self.build()
+            coopy.check_sat()
+            coopy.enable_cache(maxsize=2, directory=directory)
+            coopy.reset()
+            x, y, r = self.build()
+            coopy.concretize()
+            self.assertEqual(coopy.solver.cache.statistics['disk_hits'], 1)
+            self.assertEqual(y, x + 1)
+            coopy.disable_cache()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+import coopy
+import gc
+
+from coopy import symbolic_int, require
+
+class TestChildren(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+
+    def test_discarded_symbols_are_released(self):
+        x = symbolic_int('x')
+        for i in range(100):
+            symbolic_int('discarded')
+        gc.collect()
+        self.assertEqual(len(coopy.solver._children), 1)
+        require(x == 3)
+        coopy.concretize()
+        self.assertEqual(x, 3)
+
+    def test_constrained_symbols_are_kept(self):
+        xs = [symbolic_int('x') for i in range(10)]
+        for i, x in enumerate(xs):
+            require(x == i)
+        gc.collect()
+        self.assertEqual(len(coopy.solver._children), 10)
+        coopy.concretize()
+        self.assertEqual(len(coopy.solver._children), 0)
+        self.assertEqual([int(x) for x in xs], list(range(10)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import coopy
+
+from coopy import symbolic_int, require
+
+class TestUnsatCores(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+
+    def test_core_labels(self):
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        upper = x < 3
+        require(x > 5, label='lower')
+        require(upper, label='upper')
+        require(y > 0, label='unrelated')
+        self.assertEqual(coopy.check_sat(), (False, None))
+        core = coopy.unsat_core()
+        self.assertEqual(sorted(core.labels), ['lower', 'upper'])
+        self.assertTrue(core['upper'][0] is upper)
+
+    def test_minimized_core(self):
+        x = symbolic_int('x')
+        require(x > 5, label='a')
+        require(x > 6, label='b')
+        require(x < 3, label='c')
+        self.assertFalse(coopy.check_sat()[0])
+        core = coopy.unsat_core(minimize=True)
+        self.assertEqual(len(core), 2)
+        self.assertTrue('c' in core)
+
+    def test_minimized_core_in_assumption_scope(self):
+        x = symbolic_int('x')
+        require(x > 5, label='a')
+        require(x > 6, label='b')
+        with coopy.assumption_scope():
+            require(x < 3)
+            self.assertFalse(coopy.check_sat()[0])
+            core = coopy.unsat_core()
+            self.assertEqual(len(coopy.unsat_core(minimize=True)), 1)
+            # The results of the last check are still those of the user's check.
+            self.assertEqual(sorted(coopy.unsat_core().labels), sorted(core.labels))
+
+    def test_relax_and_retry(self):
+        x = symbolic_int('x')
+        require(x > 5, label='lower')
+        require(x < 3, label='upper')
+        with self.assertRaises(coopy.Unsatisfiable) as context:
+            coopy.model()
+        self.assertTrue('upper' in context.exception.core)
+        coopy.relax('upper')
+        coopy.concretize()
+        self.assertTrue(x > 5)
+
+    def test_enforce(self):
+        x = symbolic_int('x')
+        require(x > 5, label='lower')
+        require(x < 3, label='upper')
+        coopy.relax('upper')
+        self.assertTrue(coopy.check_sat()[0])
+        coopy.enforce('upper')
+        self.assertFalse(coopy.check_sat()[0])
+
+    def test_unlabelled_conflicts(self):
+        x = symbolic_int('x')
+        require(x > 5)
+        require(x < 3)
+        self.assertEqual(coopy.check_sat(), (False, None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import coopy
+
+from concurrent.futures import ThreadPoolExecutor
+from coopy import symbolic_int, require
+from coopy.smt import backend
+from coopy.smt.z3 import components
+
+class TestDecomposition(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+        # Solve each component on its own, however small.
+        self.batch_size = backend.decomposition_batch_size
+        backend.decomposition_batch_size = 1
+
+    def tearDown(self):
+        backend.decomposition_batch_size = self.batch_size
+
+    def build(self, n=4):
+        groups = []
+        for i in range(n):
+            x = symbolic_int('x')
+            y = symbolic_int('y')
+            require((x > i) & (y == x + 1))
+            groups.append((x, y))
+        return groups
+
+    def test_components(self):
+        self.build()
+        self.assertEqual(len(components(coopy.solver.assertions)), 4)
+
+    def test_sequential(self):
+        groups = self.build()
+        coopy.concretize(decompose=True)
+        for i, (x, y) in enumerate(groups):
+            self.assertTrue(x > i)
+            self.assertEqual(y, x + 1)
+
+    def test_parallel(self):
+        groups = self.build()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            coopy.concretize(decompose=True, pool=pool)
+        for i, (x, y) in enumerate(groups):
+            self.assertTrue(x > i)
+            self.assertEqual(y, x + 1)
+
+    def test_evaluation_across_components(self):
+        (x1, y1), (x2, y2) = self.build(2)
+        model = coopy.solver.model(decompose=True)
+        self.assertEqual(model[x1 + x2], model[x1] + model[x2])
+
+    def test_unsatisfiable_component(self):
+        self.build(2)
+        x = symbolic_int('x')
+        require((x > 1) & (x < 0))
+        with self.assertRaises(coopy.Unsatisfiable):
+            coopy.concretize(decompose=True)
+
+    def test_unsatisfiable_single_component(self):
+        x = symbolic_int('x')
+        require((x > 1) & (x < 0))
+        with self.assertRaises(coopy.Unsatisfiable):
+            coopy.concretize(decompose=True)
+
+    def test_shared_sorts_are_not_split(self):
+        S = coopy.sort('S')
+        a = coopy.symbolic('a', S)
+        b = coopy.symbolic('b', S)
+        c = coopy.symbolic('c', S)
+        d = coopy.symbolic('d', S)
+        p = coopy.symbolic('p', S)
+        coopy.forall([p], (p == a) | (p == b)).require()
+        require(c != d)
+        self.assertEqual(len(components(coopy.solver.assertions)), 1)
+        coopy.concretize(decompose=True)
+        self.assertTrue(c != d)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import coopy
+
+from coopy import *
+
+class TestEnums(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+        self.Colour = enum_sort('Colour', ['red', 'green', 'blue'])
+
+    def test_members(self):
+        red, green, blue = self.Colour
+        self.assertEqual(len(self.Colour), 3)
+        self.assertIs(self.Colour['green'], green)
+        self.assertEqual([c.name for c in self.Colour], ['red', 'green', 'blue'])
+
+    def test_decoding(self):
+        red, green, blue = self.Colour
+        x, y = symbolic('x', self.Colour), symbolic('y', self.Colour)
+        different = x != y
+        require(x != red)
+        require(x != blue)
+        require(different)
+        require(y != green)
+        concretize()
+        # Values are decoded to the members themselves.
+        self.assertIs(x.value, green)
+        self.assertTrue(x == green)
+        self.assertTrue(different.value)
+        self.assertIn(y.value, (red, blue))
+
+    def test_functions_and_arrays(self):
+        red, green, blue = self.Colour
+        f = function('f', self.Colour, self.Colour)
+        a = symbolic_array('a', index=self.Colour, element=int)
+        x = symbolic('x', self.Colour)
+        require(f(red) == green)
+        require(f(green) == blue)
+        require(x == f(f(red)))
+        require(a[x] == 4)
+        concretize()
+        self.assertIs(x.value, blue)
+        self.assertIs(f(x.value), f(blue))
+        self.assertEqual(a[blue], 4)
+
+    def test_same_declaration(self):
+        red = self.Colour['red']
+        x = symbolic('x', self.Colour)
+        require(x == red)
+        Colour = enum_sort('Colour', ['red', 'green', 'blue'])
+        self.assertIs(Colour, self.Colour)
+        concretize()
+        self.assertIs(x.value, red)
+        self.assertTrue(x == red)
+
+    def test_redeclaration(self):
+        reset()
+        Colour = enum_sort('Colour', ['red', 'green', 'blue'])
+        x = symbolic('x', Colour)
+        require(x == Colour['blue'])
+        concretize()
+        self.assertIs(x.value, Colour['blue'])
+        with self.assertRaises(Exception):
+            enum_sort('Colour', ['cyan', 'magenta'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+import coopy
+
+from coopy import symbolic_int, symbolic_bool, symbolic_real, require
+from coopy.smt import backend
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+
+    def test_roundtrip(self):
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        b = symbolic_bool('b')
+        require((x > 2) & (x < 5) & (y == x * 2) & b)
+        smt2, manifest = coopy.export()
+        self.assertFalse(manifest['optimizer'])
+        self.assertEqual(len(manifest['symbols']), 3)
+        values = coopy.solve_smtlib(smt2, manifest)
+        coopy.concretize(model=coopy.import_model(values))
+        self.assertTrue(x in (3, 4))
+        self.assertEqual(y, x * 2)
+        self.assertTrue(b)
+
+    def test_sidecar(self):
+        x = symbolic_int('x')
+        r = symbolic_real('r')
+        require((x == 3) & (r * 2 == x))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'query.smt2')
+            coopy.export(path)
+            with open(path) as f:
+                smt2 = f.read()
+            with open(path + '.json') as f:
+                manifest = json.load(f)
+        values = json.loads(json.dumps(coopy.solve_smtlib(smt2, manifest)))
+        model = coopy.import_model(values)
+        self.assertEqual(model[x], 3)
+        self.assertEqual(model[r * 2], 3)
+
+    def test_optimizer_and_labels(self):
+        with coopy.optimizer():
+            x = symbolic_int('x')
+            require((x >= 0) & (x <= 10))
+            require(x < 7, label='upper')
+            coopy.maximize(x)
+            smt2, manifest = coopy.export()
+            self.assertTrue(manifest['optimizer'])
+            values = coopy.solve_smtlib(smt2, manifest)
+            self.assertEqual(coopy.import_model(values)[x], 6)
+
+    def test_unsatisfiable(self):
+        x = symbolic_int('x')
+        require((x > 2) & (x < 1))
+        self.assertEqual(coopy.solve_smtlib(*coopy.export()), None)
+
+    def test_unsupported_sorts(self):
+        a = coopy.symbolic_int_array('a')
+        require(a[0] == 1)
+        self.assertRaises(Exception, coopy.export)
+        coopy.reset()
+        hue = coopy.enum_sort('Hue', ['red', 'green'])
+        c = coopy.symbolic('c', hue)
+        require(c != hue['red'])
+        self.assertRaises(Exception, coopy.export)
+
+    def test_functions(self):
+        x = symbolic_int('x')
+        f = coopy.function('f', coopy.int_sort(), coopy.int_sort())
+        require(f(x) == 3)
+        with self.assertRaises(Exception) as context:
+            coopy.export()
+        self.assertIn('functions', str(context.exception))
+        self.assertEqual(backend.name(f.symbol), 'f')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import time
+import unittest
+import coopy
+
+from coopy import symbolic_int, symbolic_bool, require, instrumentation
+from coopy.smt import backend, fd
+
+class TestFiniteDomain(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+        instrumentation.reset()
+        coopy.enable_instrumentation()
+
+    def tearDown(self):
+        coopy.disable_instrumentation()
+
+    def test_engine(self):
+        x, y = ('var', 0), ('var', 1)
+        bounds = [('ge', x, ('const', 0)), ('le', x, ('const', 5)), ('or', ('eq', y, ('const', 2)), ('eq', y, ('const', 4)))]
+        values = fd.solve(bounds + [('eq', ('add', x, y), ('const', 7))], ['int', 'int'])
+        self.assertEqual(sum(values), 7)
+        self.assertFalse(fd.solve(bounds + [('gt', ('add', x, y), ('const', 9))], ['int', 'int']))
+        self.assertEqual(fd.solve([('ge', x, ('const', 0))], ['int']), None)
+
+    def test_small_models(self):
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        b = symbolic_bool('b')
+        require((x >= 0) & (x < 10) & (y >= 0) & (y < 10))
+        require((x + y == 12) & (x != y) & (b == (x > y)))
+        coopy.concretize()
+        self.assertEqual(instrumentation.totals.counts['finite_domain_checks'], 1)
+        self.assertEqual(instrumentation.totals.counts['checks'], 0)
+        self.assertEqual(x + y, 12)
+        self.assertNotEqual(x, y)
+        self.assertEqual(b, x > y)
+
+    def test_unsatisfiable(self):
+        x = symbolic_int('x')
+        require((x >= 0) & (x < 3) & (x * x == 5))
+        self.assertEqual(coopy.check_sat(), (False, None))
+        with self.assertRaises(coopy.Unsatisfiable):
+            coopy.model()
+
+    def test_search_budget(self):
+        # Unsatisfiable, but without bound propagation the engine would have
+        # to go through all 10^7 assignments one by one. Z3 takes over instead.
+        xs = [symbolic_int('x') for i in range(7)]
+        for x in xs:
+            require((x >= 0) & (x <= 9))
+        require(sum(xs) == 9 * len(xs) + 1)
+        start = time.perf_counter()
+        self.assertEqual(coopy.check_sat(), (False, None))
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual(instrumentation.totals.counts['finite_domain_checks'], 0)
+        self.assertEqual(instrumentation.totals.counts['checks'], 1)
+
+    def test_fallback(self):
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        require((x >= 0) & (x < 10) & (y > x))
+        coopy.concretize()
+        self.assertEqual(instrumentation.totals.counts['finite_domain_checks'], 0)
+        self.assertTrue(y > x)
+
+    def test_disabled(self):
+        limit = backend.finite_domain_limit
+        backend.finite_domain_limit = 0
+        try:
+            x = symbolic_int('x')
+            require((x >= 0) & (x < 10) & (x > 7))
+            coopy.concretize()
+            self.assertEqual(instrumentation.totals.counts['finite_domain_checks'], 0)
+            self.assertTrue(x > 7)
+        finally:
+            backend.finite_domain_limit = limit
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import coopy
+
+from coopy import symbolic_int, require
+
+class TestHints(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+
+    def test_dictionary_hints(self):
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        require((x >= 0) & (x <= 100) & (y >= 0) & (y <= 100) & (x + y > 50))
+        coopy.concretize(hints={x: 42, y: 17})
+        self.assertEqual((x, y), (42, 17))
+
+    def test_model_hints(self):
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        require((x >= 0) & (x <= 100) & (y >= 0) & (y <= 100))
+        previous = coopy.model(hints={x: 42, y: 17})
+        require(x + y > 50)
+        model = coopy.model(hints=previous)
+        self.assertEqual((model[x], model[y]), (42, 17))
+
+    def test_inconsistent_hints(self):
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        require((x >= 0) & (x <= 10) & (y > x))
+        coopy.concretize(hints={x: 5, y: 2})
+        self.assertTrue(0 <= x <= 10)
+        self.assertTrue(y > x)
+
+    def test_optimizer_hints(self):
+        with coopy.optimizer():
+            x = symbolic_int('x')
+            y = symbolic_int('y')
+            require((x >= 0) & (x <= 10) & (y >= 0) & (y <= 10))
+            coopy.maximize(x)
+            coopy.concretize(hints={x: 3, y: 7})
+            self.assertEqual((x, y), (10, 7))
+
+    def test_hints_do_not_persist(self):
+        x = symbolic_int('x')
+        require(x >= 0)
+        self.assertEqual(coopy.model(hints={x: 42})[x], 42)
+        self.assertEqual(coopy.model(hints={x: 7})[x], 7)
+        # Nothing is left behind in the solver by the hinted solves.
+        require(x > 50)
+        self.assertTrue(coopy.model()[x] > 50)
+
+    def test_decomposed_hints(self):
+        x = symbolic_int('x')
+        require(x >= 0)
+        self.assertRaises(Exception, coopy.model, decompose=True, hints={x: 42})
+
+if __name__ == '__main__':
+    unittest.main()
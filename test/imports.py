@@ -0,0 +1,20 @@
+import subprocess
+import sys
+import unittest
+
+class TestImports(unittest.TestCase):
+
+    def run_script(self, script):
+        return subprocess.run([sys.executable, '-c', script],
+            stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+
+    def test_backend_is_loaded_lazily(self):
+        self.assertEqual(self.run_script(
+            "import coopy, sys; print('z3' in sys.modules, coopy.solver.backend_loaded)"), 'False False')
+
+    def test_backend_is_loaded_on_first_symbol(self):
+        self.assertEqual(self.run_script(
+            "import coopy, sys; coopy.symbolic_int('x'); print('z3' in sys.modules)"), 'True')
+
+if __name__ == '__main__':
+    unittest.main()
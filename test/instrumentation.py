@@ -0,0 +1,66 @@
+import unittest
+import coopy
+
+from coopy import symbolic_int, require, instrumentation
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+        instrumentation.reset()
+
+    def tearDown(self):
+        coopy.disable_instrumentation()
+
+    def test_disabled_by_default(self):
+        x = symbolic_int('x')
+        require(x + 1 > 2)
+        coopy.concretize()
+        self.assertEqual(len(instrumentation.totals.counts), 0)
+        self.assertEqual(len(instrumentation.calls), 0)
+
+    def test_counts_and_times(self):
+        coopy.enable_instrumentation()
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        require((x + y > 2) & (x < y))
+        coopy.concretize()
+        totals = instrumentation.totals
+        self.assertEqual(totals.counts['nodes'], 4)
+        self.assertEqual(totals.counts['lowered'], 4)
+        self.assertEqual(totals.counts['assertions'], 1)
+        self.assertEqual(totals.counts['checks'], 1)
+        for phase in ('lowering', 'simplify', 'check', 'solve', 'extraction'):
+            self.assertTrue(phase in totals.times)
+        self.assertTrue(len(totals.statistics) > 0)
+
+    def test_calls_and_hooks(self):
+        coopy.enable_instrumentation()
+        events = []
+        hook = lambda event, record: events.append(event)
+        instrumentation.add_hook(hook)
+        try:
+            x = symbolic_int('x')
+            require(x > 2)
+            coopy.concretize()
+        finally:
+            instrumentation.remove_hook(hook)
+        self.assertEqual(events, ['check', 'concretize'])
+        call = instrumentation.calls[-1]
+        self.assertEqual(call.counts['checks'], 1)
+        self.assertTrue(call.times['solve'] >= call.times['check'])
+
+    def test_scope_records(self):
+        coopy.enable_instrumentation()
+        x = symbolic_int('x')
+        require(x > 2)
+        with coopy.scope():
+            y = symbolic_int('y')
+            require(y > 2)
+            require(y < 5)
+            self.assertEqual(instrumentation.scope().counts['assertions'], 2)
+        self.assertEqual(instrumentation.scope().counts['assertions'], 1)
+        self.assertEqual(instrumentation.totals.counts['assertions'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
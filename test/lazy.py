@@ -0,0 +1,55 @@
+import unittest
+import coopy
+
+from coopy import *
+
+class TestLazyConcretization(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+        self.xs = [symbolic_int('x') for i in range(3)]
+        x, y, z = self.xs
+        require((x > 0) & (y > 0) & (z > 0) & (x + y + z == 12))
+
+    def assertions(self):
+        return len(coopy.solver._active_scope.assertions)
+
+    def test_pins_on_first_read(self):
+        x, y, z = self.xs
+        count = self.assertions()
+        concretize(lazy=True)
+        self.assertEqual(self.assertions(), count)
+        value = x.value
+        self.assertEqual(self.assertions(), count + 1)
+        self.assertEqual(x.value, value)
+        self.assertEqual(self.assertions(), count + 1)
+        self.assertEqual(x + y + z, 12)
+        self.assertEqual(self.assertions(), count + 3)
+
+    def test_materialize(self):
+        x, y, z = self.xs
+        count = self.assertions()
+        concretize(lazy=True)
+        materialize([x, y])
+        self.assertEqual(self.assertions(), count + 2)
+        check_sat()
+        self.assertTrue(x.concretized and y.concretized)
+        self.assertFalse(z.concretized)
+
+    def test_unread_symbols_are_released(self):
+        x, y, z = self.xs
+        concretize(lazy=True)
+        value = x.value
+        # Solving again drops values that were never read.
+        require(z == 12 - value - 1)
+        concretize()
+        self.assertEqual((x.value, y.value, z.value), (value, 1, 11 - value))
+
+    def test_arrays(self):
+        a = symbolic_int_array('a')
+        require(a[4] == 7)
+        concretize(lazy=True)
+        self.assertEqual(a[4], 7)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import coopy
 
 from coopy import symbolic_int, require
+from coopy.smt.z3 import Z3CustomTypeWrapper
 
 class TestOptimizezr(unittest.TestCase):
 
@@ -35,5 +36,89 @@ class TestOptimizezr(unittest.TestCase):
             self.assertEqual(y, 2)
             self.assertEqual(x, 3)
 
+    def test_box_priority(self):
+        with coopy.optimizer(priority='box'):
+            x = symbolic_int('x')
+            y = symbolic_int('y')
+
+            require((x > 0) & (y > 0) & (x + y < 12))
+
+            x_max = coopy.maximize(x)
+            y_max = coopy.maximize(y)
+            coopy.check_sat()
+
+            self.assertEqual(x_max.value, 10)
+            self.assertEqual(y_max.value, 10)
+
+    def test_pareto_front(self):
+        with coopy.optimizer(priority='pareto'):
+            x = symbolic_int('x')
+            y = symbolic_int('y')
+
+            require((x > 0) & (y > 0) & (x + y < 5))
+
+            coopy.maximize(x)
+            coopy.maximize(y)
+            front = sorted((m[x], m[y]) for m in coopy.pareto_front())
+
+            self.assertEqual(front, [(1, 3), (2, 2), (3, 1)])
+
+    def test_improving_models(self):
+        with coopy.optimizer():
+            x = symbolic_int('x')
+            y = symbolic_int('y')
+
+            require((x > 0) & (x < 100) & (y > x))
+
+            coopy.minimize(y)
+            coopy.minimize(x)
+            values = [(m[y], m[x]) for m in coopy.improving_models()]
+
+            self.assertEqual(values[-1], (2, 1))
+            self.assertEqual(values, sorted(values, reverse=True))
+
+            coopy.concretize(model=coopy.improving_models().__next__())
+            self.assertTrue(0 < x < y)
+
+    def test_on_model(self):
+        models = []
+        with coopy.optimizer(on_model=models.append):
+            x = symbolic_int('x')
+            require((x > 0) & (x < 100))
+            coopy.concretize(minimize=x)
+            self.assertEqual(x, 1)
+            self.assertEqual(models[-1][x], 1)
+
+    def test_weighted_soft_constraints(self):
+        for engine in coopy.solver.maxsat_engines:
+            with coopy.optimizer(maxsat=engine):
+                x = symbolic_int('x')
+                coopy.soft(x == 1, weight=1)
+                coopy.soft(x == 2, weight=5)
+                coopy.soft(x == 3, weight=2)
+                coopy.concretize()
+                self.assertEqual(x, 2)
+
+    def test_soft_constraint_groups(self):
+        with coopy.optimizer():
+            x = symbolic_int('x')
+            y = symbolic_int('y')
+            require(x != y)
+            coopy.soft(x == 1, weight=1, group='first')
+            coopy.soft(y == 1, weight=10, group='second')
+            coopy.concretize()
+            # Groups are optimized lexicographically in declaration order.
+            self.assertEqual(x, 1)
+
+    def test_unbounded_objective(self):
+        with coopy.optimizer():
+            x = symbolic_int('x')
+            require(x > 0)
+            x_max = coopy.maximize(x)
+            coopy.check_sat()
+            # The optimum is not a numeral, so it is returned as the raw term.
+            self.assertNotIsInstance(x_max.value, Z3CustomTypeWrapper)
+            self.assertIn('oo', str(x_max.value))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
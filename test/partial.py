@@ -0,0 +1,55 @@
+import unittest
+import coopy
+
+from coopy import *
+
+class TestPartialConcretization(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+
+    def test_only(self):
+        x, y = symbolic_int('x'), symbolic_int('y')
+        require((x > 0) & (x < 5) & (y > 0) & (y < 5))
+        concretize(only=[x])
+        self.assertTrue(x.concretized)
+        self.assertFalse(y.concretized)
+        # The value of x is kept in later stages.
+        value = x.value
+        require(y == 5 - x)
+        concretize()
+        self.assertEqual((x.value, y.value), (value, 5 - value))
+
+    def test_where(self):
+        plan = [symbolic_int('stage1') for i in range(3)] + [symbolic_int('stage2') for i in range(3)]
+        for a, b in zip(plan, plan[1:]):
+            require(a < b)
+        require(plan[0] >= 0)
+        concretize(where=lambda symbol: symbol.name.startswith('stage1'))
+        self.assertEqual([s.concretized for s in plan], [True] * 3 + [False] * 3)
+        require(plan[-1] - plan[2] == 3)
+        concretize()
+        self.assertEqual(plan[-1] - plan[2], 3)
+
+    def test_unsatisfiable_stage(self):
+        x, y = symbolic_int('x'), symbolic_int('y')
+        require((x >= 0) & (x <= 1) & (y >= 0))
+        concretize(only=[x], hints={x: 1})
+        require(y + x == 0)
+        self.assertFalse(check_sat()[0])
+
+    def test_only_foreign_symbols(self):
+        x = symbolic_int('x')
+        require((x > 0) & (x < 5))
+        with scope():
+            y = symbolic_int('y')
+            require(y > x)
+            # Neither symbols of outer scopes nor expressions can be selected.
+            self.assertRaises(Exception, concretize, only=[x])
+            self.assertRaises(Exception, concretize, only=[y, x + 1])
+            self.assertFalse(y.concretized)
+            concretize(only=[y])
+            self.assertTrue(y.concretized)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import coopy
+
+from coopy import *
+
+class TestQuantifiers(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+        self.S = sort('S')
+        self.f = function('f', self.S, self.S)
+        self.g = function('g', self.S, self.S, self.S)
+
+    def test_patterns(self):
+        p, q = symbolic('p', self.S), symbolic('q', self.S)
+        axiom = forall([p], self.f(p) != p, patterns=[self.f(p)], weight=3, qid='no_fixpoint')
+        sexpr = axiom.value.sexpr()
+        self.assertIn(':pattern ((f', sexpr)
+        self.assertIn(':weight 3', sexpr)
+        self.assertIn(':qid no_fixpoint', sexpr)
+        # Multi-patterns are given as tuples of terms.
+        axiom = forall([p, q], self.g(p, q) == self.g(q, p), patterns=[(self.f(p), self.f(q))])
+        self.assertEqual(axiom.value.sexpr().count(':pattern'), 1)
+        require(axiom)
+        self.assertTrue(check_sat()[0])
+
+    def test_bounded_expansion(self):
+        x, i = symbolic_int('x'), symbolic_int('i')
+        require((x >= 0) & (x <= 3))
+        require(forall([i], x != i, domain=range(3)))
+        concretize()
+        self.assertEqual(x, 3)
+
+    def test_bounded_expansion_of_exists(self):
+        x, i, j = symbolic_int('x'), symbolic_int('i'), symbolic_int('j')
+        require(exists([i, j], x == 10 * i + j, domains=[[1, 2], [7]]))
+        require(x > 20)
+        concretize()
+        self.assertEqual(x, 27)
+
+    def test_expansion_over_enumerated_sorts(self):
+        Side = enum_sort('Side', ['left', 'right'])
+        left, right = Side
+        h = function('h', Side, Side)
+        c = symbolic('c', Side)
+        require(forall([c], h(c) != c, domain=Side))
+        concretize()
+        self.assertIs(h(left), right)
+        self.assertIs(h(right), left)
+
+    def test_domains_per_variable(self):
+        i, j = symbolic_int('i'), symbolic_int('j')
+        with self.assertRaises(Exception):
+            forall([i, j], i != j, domains=[[0, 1]])
+
+    def test_iff(self):
+        a, b = symbolic_bool('a'), symbolic_bool('b')
+        require(iff(a, b))
+        require(a)
+        concretize()
+        self.assertTrue(b)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import coopy
 
 from coopy.symbolic.types.primitives import SymbolicReal
+from fractions import Fraction
 
 class TestReals(unittest.TestCase):
 
@@ -13,5 +14,37 @@ class TestReals(unittest.TestCase):
         self.assertTrue(not x is None)
         self.assertTrue(isinstance(x, SymbolicReal))
 
+    def test_concretization(self):
+        x = coopy.symbolic_real('x')
+        y = coopy.symbolic_real('y')
+        coopy.require(x * 7 == 3)
+        coopy.require(y == 0)
+        coopy.concretize()
+        self.assertEqual(x.exact_value, Fraction(3, 7))
+        self.assertEqual(x.value, 3 / 7)
+        self.assertEqual(float(x), 3 / 7)
+        self.assertEqual(y.value, 0.0)
+
+    def test_irrational_values(self):
+        x = coopy.symbolic_real('x', precision=10)
+        coopy.require((x * x == 2) & (x > 0))
+        coopy.concretize()
+        self.assertAlmostEqual(x.value, 2 ** 0.5, places=9)
+
+    def test_model_evaluation(self):
+        x = coopy.symbolic_real('x')
+        coopy.require(x * 3 == 1)
+        model = coopy.model()
+        self.assertEqual(model[x * 2].value, 2 / 3)
+
+    def test_real_vector(self):
+        xs = [coopy.symbolic_real('x') for i in range(5)]
+        for i, x in enumerate(xs):
+            coopy.require(x * 4 == i)
+        model = coopy.model()
+        self.assertEqual(list(coopy.real_vector(xs, model)), [i / 4 for i in range(5)])
+        coopy.concretize(model=model)
+        self.assertEqual(list(coopy.real_vector(xs)), [x.value for x in xs])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import unittest
+import coopy
+
+from coopy import symbolic_int, require
+
+class TestSolutions(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+
+    def test_enumerate_all(self):
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        require((x >= 0) & (x < 3) & (y >= 0) & (y < 3) & (x != y))
+        solutions = {(int(m[x]), int(m[y])) for m in coopy.solutions()}
+        self.assertEqual(len(solutions), 6)
+        self.assertTrue(all(a != b for a, b in solutions))
+
+    def test_projection_and_limit(self):
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        require((x >= 0) & (x < 3) & (y >= 0) & (y < 100))
+        solutions = [int(m[x]) for m in coopy.solutions(over=[x])]
+        self.assertEqual(sorted(solutions), [0, 1, 2])
+        self.assertEqual(len(list(coopy.solutions(limit=5))), 5)
+
+    def test_enumeration_leaves_no_constraints_behind(self):
+        x = symbolic_int('x')
+        require((x >= 0) & (x < 2))
+        for model in coopy.solutions():
+            pass
+        # Blocking clauses are retired once an enumeration is over, or closed.
+        enumeration = coopy.solutions()
+        next(enumeration)
+        enumeration.close()
+        self.assertEqual(len(list(coopy.solutions())), 2)
+        coopy.concretize()
+        self.assertTrue(x in (0, 1))
+
+    def test_require_while_enumerating(self):
+        x = symbolic_int('x')
+        y = symbolic_int('y')
+        require((x >= 0) & (x < 3))
+        values = []
+        for model in coopy.solutions(over=[x]):
+            values.append(int(model[x]))
+            require(y > x)
+        self.assertEqual(sorted(values), [0, 1, 2])
+        # Constraints required during the enumeration are kept afterwards.
+        require(y < 1)
+        self.assertFalse(coopy.check_sat()[0])
+
+if __name__ == '__main__':
+    unittest.main()
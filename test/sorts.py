@@ -46,6 +46,43 @@ class TestSorts(unittest.TestCase):
         self.assertFalse(f(y) == y)
         self.assertFalse(f(z) == z)
 
+    def test_function_tables(self):
+        x, y, z = self.vars()
+        forall([x], (x == y) | (x == z)).require()
+        f = self.f
+        forall([x], f(x) != x).require()
+        concretize()
+        # Tables of functions over custom sorts are filled from the universe.
+        self.assertTrue(f(y) == z)
+        self.assertEqual(len(f._table), 2)
+        for i in range(10):
+            self.assertTrue(f(f(y)) == y)
+        self.assertEqual(len(f._table), 2)
+
+    def test_function_tables_over_integers(self):
+        g = function('g', int_sort(), int_sort())
+        a = symbolic_int('a')
+        b = symbolic_int('b')
+        require((a == 1) & (b == 2) & (g(a) == 5) & (g(b) == 7))
+        concretize()
+        self.assertEqual(g(a), 5)
+        self.assertEqual(g(b), 7)
+        self.assertEqual(g(a), 5)
+        self.assertEqual(len(g._table), 2)
+
+    def test_hashable_values(self):
+        x, y, z = self.vars()
+        require(x == y)
+        require(x != z)
+        concretize()
+        # Concrete values are interned, so they compare by identity and can be
+        # used in sets and as dictionary keys.
+        self.assertIs(x.value, x.value)
+        self.assertIs(x.value, y.value)
+        self.assertEqual(len({x.value, y.value, z.value}), 2)
+        names = {x.value: 'x', z.value: 'z'}
+        self.assertEqual(names[y.value], 'x')
+
     def test_disjunction_of_function_calls(self):
         x, y, z = self.vars()
         # Require x being equal either to y, or to z.
@@ -0,0 +1,74 @@
+import unittest
+import coopy
+
+from coopy import symbolic_int, require
+
+class TestTemplates(unittest.TestCase):
+
+    def setUp(self):
+        coopy.reset()
+
+    def test_parameter_binding(self):
+
+        @coopy.template
+        def model(lower, double: bool):
+            x = symbolic_int('x')
+            y = symbolic_int('y')
+            require(x > lower)
+            require(y == coopy.ite(double, 2 * x, x))
+            return x, y
+
+        x, y = model.outputs
+
+        for lower in (1, 10, 100):
+            sat, m = model(lower=lower, double=True)
+            self.assertTrue(sat)
+            self.assertTrue(m[x] > lower)
+            self.assertEqual(m[y], 2 * m[x])
+
+        sat, m = model(lower=5, double=False)
+        self.assertEqual(m[y], m[x])
+
+    def test_unsatisfiable_binding(self):
+
+        @coopy.template
+        def model(n):
+            x = symbolic_int('x')
+            require((x > 0) & (x < n))
+            return x
+
+        self.assertFalse(model(n=1)[0])
+        self.assertTrue(model(n=2)[0])
+        self.assertEqual(model(n=2)[1][model.outputs], 1)
+
+    def test_template_does_not_affect_scope(self):
+
+        @coopy.template
+        def model(n):
+            require(n == 2)
+
+        x = symbolic_int('x')
+        require(x == 3)
+        coopy.concretize()
+        self.assertEqual(x, 3)
+        self.assertTrue(model(n=2)[0])
+        self.assertFalse(model(n=3)[0])
+
+    def test_repeated_bindings(self):
+
+        @coopy.template
+        def model(n):
+            x = symbolic_int('x')
+            require((x > 0) & (x < n))
+            return x
+
+        self.assertTrue(model(n=3)[0])
+        self.assertFalse(model(n=1)[0])
+        assertions = len(model._scope.assertions)
+        # Values bound before are assumed again, without asserting anything.
+        for n in (3, 1, 3):
+            self.assertEqual(model(n=n)[0], n == 3)
+        self.assertEqual(len(model._scope.assertions), assertions)
+
+if __name__ == '__main__':
+    unittest.main()